@@ -0,0 +1,430 @@
+import json
+import math
+import random
+import re
+import subprocess
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.models import Category, Genre, Review, Title
+
+User = get_user_model()
+
+SAMPLE_SIZE = 10000
+
+SCENARIOS = {
+    'titles_list': 30,
+    'titles_filter': 15,
+    'reviews_read': 20,
+    'review_write': 5,
+    'comments_read': 15,
+    'comment_write': 5,
+    'auth': 10,
+}
+
+EXPECTED_STATUSES = {
+    'titles_list': {200},
+    'titles_filter': {200},
+    'reviews_read': {200},
+    'review_write': {201, 400},
+    'comments_read': {200},
+    'comment_write': {201},
+    'auth': {200},
+}
+
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+
+def percentile(values, percent):
+    """Процентиль методом ближайшего ранга."""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[max(math.ceil(percent / 100 * len(values)) - 1, 0)]
+
+
+def get_commit():
+    try:
+        return subprocess.run(
+            ('git', 'rev-parse', '--short', 'HEAD'),
+            capture_output=True, text=True, check=True,
+            cwd=settings.BASE_DIR
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class InProcessTransport:
+    """
+    Запросы к WSGI-приложению в том же процессе.
+    Все запросы приходят с одного адреса, поэтому на время работы
+    транспорта ограничение частоты запросов отключается.
+    """
+
+    def __init__(self):
+        self.client = Client()
+        self.settings = override_settings(THROTTLING_ENABLED=False)
+
+    def __enter__(self):
+        self.settings.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.settings.disable()
+
+    def count_queries(self, counter):
+        def wrapper(execute, sql, params, many, context):
+            counter[0] += 1
+            return execute(sql, params, many, context)
+        return wrapper
+
+    def send(self, method, path, data, headers):
+        counter = [0]
+        meta = {
+            f'HTTP_{name.upper().replace("-", "_")}': value
+            for name, value in headers.items()
+        }
+        with connections['default'].execute_wrapper(
+            self.count_queries(counter)
+        ):
+            response = getattr(self.client, method.lower())(
+                path,
+                data=json.dumps(data) if data is not None else None,
+                content_type='application/json',
+                **meta
+            )
+        return response.status_code, counter[0]
+
+
+class HttpTransport:
+    """
+    Запросы к запущенному серверу по HTTP.
+    Количество SQL-запросов берётся из заголовка Server-Timing,
+    если на сервере включён REQUEST_TIMING_ENABLED. Ограничение
+    частоты запросов выключается на сервере настройкой
+    THROTTLING_ENABLED, иначе часть запросов получит ответ 429.
+    """
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def send(self, method, path, data, headers):
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=json.dumps(data).encode() if data is not None else None,
+            method=method,
+            headers={'Content-Type': 'application/json', **headers},
+        )
+        try:
+            with urllib.request.urlopen(request) as response:
+                response.read()
+                status, response_headers = response.status, response.headers
+        except urllib.error.HTTPError as error:
+            status, response_headers = error.code, error.headers
+        match = SERVER_TIMING_QUERIES.search(
+            response_headers.get('Server-Timing', '')
+        )
+        return status, int(match.group(1)) if match else None
+
+
+class Command(BaseCommand):
+    help = """Нагрузочный тест API v1 по взвешенным сценариям"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=1000,
+            help='Количество запросов, по которым считаются результаты'
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=50,
+            help='Количество запросов прогрева, не входящих в результаты'
+        )
+        parser.add_argument(
+            '--url',
+            help=(
+                'Адрес запущенного сервера, например http://127.0.0.1:8000, '
+                'с выключенным THROTTLING_ENABLED; без него запросы '
+                'выполняются в текущем процессе'
+            )
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=1,
+            help='Количество параллельных клиентов в режиме --url'
+        )
+        parser.add_argument(
+            '--weights',
+            default='',
+            help=(
+                'Веса сценариев через запятую, например '
+                '"titles_list=10,auth=0"; сценарии: '
+                + ', '.join(SCENARIOS)
+            )
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Начальное значение генератора плана запросов'
+        )
+        parser.add_argument(
+            '--output',
+            help='JSON-файл для сохранения результатов'
+        )
+        parser.add_argument(
+            '--compare',
+            help='JSON-файл с результатами для сравнения'
+        )
+
+    def get_weights(self, value):
+        weights = dict(SCENARIOS)
+        for item in filter(None, value.split(',')):
+            name, _, weight = item.partition('=')
+            if name not in SCENARIOS or not weight.isdigit():
+                raise CommandError(
+                    f'Неверный вес сценария "{item}". '
+                    f'Сценарии: {", ".join(SCENARIOS)}'
+                )
+            weights[name] = int(weight)
+        if not any(weights.values()):
+            raise CommandError('Хотя бы один сценарий должен иметь вес')
+        return weights
+
+    def load_samples(self):
+        """Идентификаторы существующих объектов для построения запросов."""
+        self.titles = list(
+            Title.objects.values_list('id', flat=True)[:SAMPLE_SIZE]
+        )
+        self.reviews = list(
+            Review.objects.values_list('title_id', 'id')[:SAMPLE_SIZE]
+        )
+        self.users = list(
+            User.objects.filter(role=User.USER, is_active=True)
+            .values_list('id', flat=True)[:SAMPLE_SIZE]
+        )
+        self.genres = list(Genre.objects.values_list('slug', flat=True))
+        self.categories = list(
+            Category.objects.values_list('slug', flat=True)
+        )
+        self.years = list(
+            Title.objects.values_list('year', flat=True).distinct()[:100]
+        )
+        if not (self.titles and self.reviews and self.users):
+            raise CommandError(
+                'Нет данных для нагрузочного теста: создайте их командой '
+                '"python manage.py generate_dataset"'
+            )
+        self.tokens = {}
+
+    def get_token(self, user_id):
+        if user_id not in self.tokens:
+            self.tokens[user_id] = str(
+                AccessToken.for_user(User(pk=user_id))
+            )
+        return self.tokens[user_id]
+
+    def build_request(self, scenario, number):
+        """Метод, путь, тело запроса и id автора для сценария."""
+        rng = self.rng
+        if scenario == 'titles_list':
+            offset = rng.randrange(max(len(self.titles) - 10, 1))
+            return 'GET', f'/api/v1/titles/?limit=10&offset={offset}', None
+        if scenario == 'titles_filter':
+            filters = [('search', f'Произведение {rng.choice(self.titles)}')]
+            if self.genres:
+                filters.append(('genre', rng.choice(self.genres)))
+            if self.categories:
+                filters.append(('category', rng.choice(self.categories)))
+            if self.years:
+                filters.append(('year', rng.choice(self.years)))
+            name, value = rng.choice(filters)
+            query = urllib.parse.urlencode({name: value})
+            return 'GET', f'/api/v1/titles/?{query}', None
+        if scenario == 'reviews_read':
+            title_id = rng.choice(self.titles)
+            return 'GET', f'/api/v1/titles/{title_id}/reviews/', None
+        if scenario == 'review_write':
+            title_id = rng.choice(self.titles)
+            return 'POST', f'/api/v1/titles/{title_id}/reviews/', {
+                'text': f'Отзыв нагрузочного теста {number}',
+                'score': rng.randint(1, 10),
+            }
+        title_id, review_id = rng.choice(self.reviews)
+        path = f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+        if scenario == 'comments_read':
+            return 'GET', path, None
+        if scenario == 'comment_write':
+            return 'POST', path, {
+                'text': f'Комментарий нагрузочного теста {number}'
+            }
+        return 'POST', '/api/v1/auth/signup/', {
+            'username': f'bench_{self.run_id}_{number}',
+            'email': f'bench_{self.run_id}_{number}@yamdb.fake',
+        }
+
+    def build_plan(self, count, weights):
+        """План запросов, полностью определяемый --seed."""
+        scenarios = list(weights)
+        plan = []
+        for number in range(count):
+            scenario = self.rng.choices(
+                scenarios, weights=[weights[name] for name in scenarios]
+            )[0]
+            method, path, data = self.build_request(scenario, number)
+            headers = {}
+            if method == 'POST' and scenario != 'auth':
+                headers['Authorization'] = (
+                    f'Bearer {self.get_token(self.rng.choice(self.users))}'
+                )
+            plan.append((scenario, method, path, data, headers))
+        return plan
+
+    def send_request(self, transport, request):
+        scenario, method, path, data, headers = request
+        started = time.perf_counter()
+        status, queries = transport.send(method, path, data, headers)
+        return scenario, status, time.perf_counter() - started, queries
+
+    def run_plan(self, transport, plan, concurrency):
+        if concurrency == 1:
+            return [self.send_request(transport, request) for request in plan]
+        with ThreadPoolExecutor(concurrency) as executor:
+            return list(executor.map(
+                lambda request: self.send_request(transport, request), plan
+            ))
+
+    def summarize_group(self, group, elapsed, errors):
+        durations = [duration * 1000 for _, _, duration, _ in group]
+        queries = [count for *_, count in group if count is not None]
+        return {
+            'requests': len(group),
+            'errors': errors,
+            'statuses': dict(Counter(
+                str(status) for _, status, _, _ in group
+            )),
+            'rps': round(len(group) / elapsed, 1) if elapsed else 0.0,
+            'mean_ms': round(sum(durations) / len(durations), 2),
+            'p50_ms': round(percentile(durations, 50), 2),
+            'p95_ms': round(percentile(durations, 95), 2),
+            'p99_ms': round(percentile(durations, 99), 2),
+            'queries_per_request': (
+                round(sum(queries) / len(queries), 2) if queries else None
+            ),
+        }
+
+    def summarize(self, results, elapsed):
+        """
+        Статистика по сценариям и общая. Ошибкой считается ответ
+        со статусом, не ожидаемым для сценария.
+        """
+        groups = defaultdict(list)
+        for result in results:
+            groups[result[0]].append(result)
+        summary = {}
+        for scenario in SCENARIOS:
+            group = groups.get(scenario)
+            if not group:
+                continue
+            summary[scenario] = self.summarize_group(group, elapsed, sum(
+                1 for _, status, _, _ in group
+                if status not in EXPECTED_STATUSES[scenario]
+            ))
+        summary['total'] = self.summarize_group(results, elapsed, sum(
+            stats['errors'] for stats in summary.values()
+        ))
+        return summary
+
+    def report(self, summary, baseline):
+        header = (
+            f'{"сценарий":<15}{"запросы":>9}{"ошибки":>8}{"rps":>9}'
+            f'{"p50, мс":>10}{"p95, мс":>10}{"p99, мс":>10}{"SQL":>7}'
+        )
+        self.stdout.write(header)
+        for scenario, stats in summary.items():
+            queries = stats['queries_per_request']
+            line = (
+                f'{scenario:<15}{stats["requests"]:>9}{stats["errors"]:>8}'
+                f'{stats["rps"]:>9.1f}{stats["p50_ms"]:>10.2f}'
+                f'{stats["p95_ms"]:>10.2f}{stats["p99_ms"]:>10.2f}'
+                f'{queries if queries is not None else "-":>7}'
+            )
+            previous = baseline.get(scenario)
+            if previous and previous['p95_ms']:
+                change = stats['p95_ms'] / previous['p95_ms'] * 100 - 100
+                line += f'  p95 {change:+.0f}%'
+            self.stdout.write(line)
+
+    def handle(self, *args, **options):
+        weights = self.get_weights(options['weights'])
+        if options['concurrency'] < 1:
+            raise CommandError('Параметр --concurrency должен быть больше 0')
+        if options['concurrency'] > 1 and not options['url']:
+            raise CommandError(
+                'Параллельные запросы поддерживаются только в режиме --url'
+            )
+        baseline = {}
+        if options['compare']:
+            baseline = json.loads(
+                Path(options['compare']).read_text(encoding='utf-8')
+            )['scenarios']
+        self.rng = random.Random(options['seed'])
+        self.run_id = f'{time.time_ns():x}'
+        self.load_samples()
+        plan = self.build_plan(
+            options['warmup'] + options['requests'], weights
+        )
+        if options['url']:
+            transport = HttpTransport(options['url'])
+        else:
+            transport = InProcessTransport()
+        with transport:
+            self.run_plan(
+                transport, plan[:options['warmup']], options['concurrency']
+            )
+            started = time.perf_counter()
+            results = self.run_plan(
+                transport, plan[options['warmup']:], options['concurrency']
+            )
+            elapsed = time.perf_counter() - started
+        summary = self.summarize(results, elapsed)
+        self.report(summary, baseline)
+        if options['output']:
+            Path(options['output']).write_text(json.dumps({
+                'commit': get_commit(),
+                'date': datetime.now(timezone.utc).isoformat(),
+                'mode': 'http' if options['url'] else 'in-process',
+                'options': {
+                    name: options[name] for name in (
+                        'requests', 'warmup', 'concurrency', 'seed', 'url'
+                    )
+                },
+                'weights': weights,
+                'scenarios': summary,
+            }, ensure_ascii=False, indent=2), encoding='utf-8')
+            self.stdout.write(self.style.SUCCESS(
+                f'Результаты сохранены в {options["output"]}'
+            ))
@@ -0,0 +1,115 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.test import APIRequestFactory
+
+from api.v1.reviews import views as reviews_views
+from api.v1.users import views as users_views
+from reviews.models import Review
+
+LIST_QUERIES = (
+    ('genres', reviews_views.GenreViewSet, {}),
+    ('categories', reviews_views.CategoryViewSet, {}),
+    ('titles', reviews_views.TitleViewSet, {}),
+    (
+        'titles?category&year',
+        reviews_views.TitleViewSet,
+        {'category': 'slug', 'year': 2000}
+    ),
+    ('titles?genre', reviews_views.TitleViewSet, {'genre': 'slug'}),
+    ('titles?search', reviews_views.TitleViewSet, {'search': 'name'}),
+    ('reviews', reviews_views.ReviewViewSet, {}),
+    ('comments', reviews_views.CommentViewSet, {}),
+    ('users', users_views.UserViewSet, {}),
+)
+
+NESTED_VIEWSETS = (reviews_views.ReviewViewSet, reviews_views.CommentViewSet)
+
+BOUNDED_ACCESS = ('CONSTANT ROW', 'VIRTUAL TABLE')
+
+LIMIT = re.compile(r'\sLIMIT \d+( OFFSET \d+)?$')
+
+
+def is_scan(line):
+    """Строка EXPLAIN QUERY PLAN со сканированием таблицы или индекса."""
+    return (
+        'SCAN' in line
+        and not any(access in line for access in BOUNDED_ACCESS)
+    )
+
+
+def get_full_scans(sql, plan):
+    """
+    Строки плана запроса с полным сканированием таблицы или индекса.
+    Сканирование ограничено, только если оно во внешнем цикле запроса
+    с LIMIT и строки не сортируются во временном B-дереве: тогда чтение
+    в порядке индекса останавливается после LIMIT строк.
+    """
+    bounded = (
+        LIMIT.search(sql.strip()) is not None
+        and not any('USE TEMP B-TREE' in line for line in plan)
+    )
+    return [
+        line for position, line in enumerate(plan)
+        if is_scan(line) and not (bounded and position == 0)
+    ]
+
+
+class Command(BaseCommand):
+    help = """Вывод EXPLAIN QUERY PLAN для запросов списков во вьюсетах API"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=10,
+            help='Размер страницы в анализируемых запросах'
+        )
+        parser.add_argument(
+            '--fail-on-scan',
+            action='store_true',
+            help='Завершиться с ошибкой при полном сканировании таблицы'
+        )
+
+    def get_view_kwargs(self):
+        """Идентификаторы родительских объектов для вложенных вьюсетов."""
+        review = Review.objects.order_by('pk').first()
+        if review is None:
+            return None
+        return {'title_id': review.title_id, 'review_id': review.pk}
+
+    def get_list_queryset(self, viewset, params, kwargs, limit):
+        """Запрос страницы списка в том виде, как его строит вьюсет."""
+        view = viewset(action_map={'get': 'list'})
+        view.format_kwarg = None
+        view.args = ()
+        view.kwargs = kwargs
+        view.request = view.initialize_request(
+            APIRequestFactory().get('/', params)
+        )
+        return view.filter_queryset(view.get_queryset())[:limit]
+
+    def handle(self, *args, **options):
+        kwargs = self.get_view_kwargs()
+        full_scans = []
+        for name, viewset, params in LIST_QUERIES:
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            if kwargs is None and viewset in NESTED_VIEWSETS:
+                self.stdout.write('  нет данных для построения запроса')
+                continue
+            queryset = self.get_list_queryset(
+                viewset, params, kwargs or {}, options['limit']
+            )
+            plan = queryset.explain().splitlines()
+            scans = get_full_scans(str(queryset.query), plan)
+            for line in plan:
+                if line in scans:
+                    full_scans.append(name)
+                    self.stdout.write(self.style.WARNING(f'  {line}'))
+                else:
+                    self.stdout.write(f'  {line}')
+        if full_scans and options['fail_on_scan']:
+            raise CommandError(
+                'Полное сканирование таблиц в запросах: '
+                f'{", ".join(sorted(set(full_scans)))}'
+            )
@@ -0,0 +1,240 @@
+import json
+import re
+import time
+import urllib.parse
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle, islice
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.management.commands.benchmark import (
+    HttpTransport, InProcessTransport, percentile
+)
+
+User = get_user_model()
+
+OBJECT_ID = re.compile(r'/\d+(?=/)')
+
+
+def get_route(method, path):
+    """Метод и путь запроса с заменой id объектов на {id}."""
+    return f'{method} {OBJECT_ID.sub("/{id}", path)}'
+
+
+class Command(BaseCommand):
+    help = """Воспроизведение записанных запросов к API"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help='Файл JSON Lines, записанный TrafficRecordingMiddleware'
+        )
+        parser.add_argument(
+            '--url',
+            help=(
+                'Адрес запущенного сервера, например http://127.0.0.1:8000, '
+                'с выключенным THROTTLING_ENABLED; без него запросы '
+                'выполняются в текущем процессе'
+            )
+        )
+        parser.add_argument(
+            '--speed',
+            type=float,
+            default=1.0,
+            help=(
+                'Множитель скорости относительно записи: 2 - вдвое быстрее; '
+                '0 - без пауз между запросами'
+            )
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=1,
+            help='Количество параллельных клиентов в режиме --url'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help='Воспроизвести только первые LIMIT запросов'
+        )
+        parser.add_argument(
+            '--output',
+            help='JSON-файл для сохранения результатов'
+        )
+
+    def read_entries(self, path, limit):
+        try:
+            with open(path, encoding='utf-8') as file:
+                entries = [
+                    json.loads(line)
+                    for line in islice(filter(str.strip, file), limit)
+                ]
+        except OSError as error:
+            raise CommandError(f'Не удалось открыть {path}: {error}')
+        except ValueError as error:
+            raise CommandError(f'Неверная строка в {path}: {error}')
+        if not entries:
+            raise CommandError(f'В файле {path} нет запросов')
+        return sorted(entries, key=lambda entry: entry['time'])
+
+    def get_tokens(self, entries):
+        """
+        Токены пользователей базы данных для записанных пользователей.
+        Разным записанным пользователям одной роли по возможности
+        соответствуют разные пользователи.
+        """
+        recorded = defaultdict(list)
+        for entry in entries:
+            users = recorded[entry['role']]
+            if entry['user'] and entry['user'] not in users:
+                users.append(entry['user'])
+        tokens = {}
+        for role, keys in recorded.items():
+            if role is None:
+                continue
+            users = list(
+                User.objects.filter(role=role, is_active=True)
+                .values_list('id', flat=True)[:len(keys)]
+            )
+            if not users:
+                self.stderr.write(
+                    f'Нет пользователей с ролью {role}, их запросы '
+                    f'отправляются без токена'
+                )
+                continue
+            for key, user_id in zip(keys, cycle(users)):
+                tokens[key] = str(AccessToken.for_user(User(pk=user_id)))
+        return tokens
+
+    def send_entry(self, transport, entry):
+        path = urllib.parse.quote(entry['path'])
+        if entry['query']:
+            path += f'?{entry["query"]}'
+        headers = {}
+        token = self.tokens.get(entry['user'])
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        started = time.perf_counter()
+        try:
+            status, _ = transport.send(
+                entry['method'], path, entry['body'], headers
+            )
+        except OSError:
+            status = 0
+        return entry, status, time.perf_counter() - started
+
+    def schedule(self, entries, speed):
+        """
+        Запросы в моменты отправки, сохраняющие интервалы между ними,
+        делённые на --speed.
+        """
+        first = entries[0]['time']
+        started = time.monotonic()
+        for entry in entries:
+            if speed:
+                delay = (
+                    started + (entry['time'] - first) / speed
+                    - time.monotonic()
+                )
+                if delay > 0:
+                    time.sleep(delay)
+            yield entry
+
+    def replay(self, transport, entries, speed, concurrency):
+        if concurrency == 1:
+            return [
+                self.send_entry(transport, entry)
+                for entry in self.schedule(entries, speed)
+            ]
+        with ThreadPoolExecutor(concurrency) as executor:
+            futures = [
+                executor.submit(self.send_entry, transport, entry)
+                for entry in self.schedule(entries, speed)
+            ]
+        return [future.result() for future in futures]
+
+    def summarize_group(self, group, elapsed):
+        durations = [duration * 1000 for _, _, duration in group]
+        return {
+            'requests': len(group),
+            'errors': sum(1 for _, status, _ in group if not 0 < status < 500),
+            'mismatches': sum(
+                1 for entry, status, _ in group if status != entry['status']
+            ),
+            'rps': round(len(group) / elapsed, 1) if elapsed else 0.0,
+            'p50_ms': round(percentile(durations, 50), 2),
+            'p95_ms': round(percentile(durations, 95), 2),
+            'p99_ms': round(percentile(durations, 99), 2),
+            'recorded_p95_ms': round(percentile(
+                [entry['duration_ms'] for entry, _, _ in group], 95
+            ), 2),
+        }
+
+    def summarize(self, results, elapsed):
+        """
+        Статистика по маршрутам и общая. Ошибкой считается ответ 5xx
+        или отсутствие ответа, расхождением - статус, отличный
+        от записанного.
+        """
+        groups = defaultdict(list)
+        for result in results:
+            entry = result[0]
+            groups[get_route(entry['method'], entry['path'])].append(result)
+        summary = {
+            route: self.summarize_group(group, elapsed)
+            for route, group in sorted(
+                groups.items(), key=lambda item: -len(item[1])
+            )
+        }
+        summary['total'] = self.summarize_group(results, elapsed)
+        return summary
+
+    def report(self, summary):
+        self.stdout.write(
+            f'{"маршрут":<50}{"запросы":>9}{"ошибки":>8}{"расхожд.":>10}'
+            f'{"p50, мс":>10}{"p95, мс":>10}{"p99, мс":>10}'
+        )
+        for route, stats in summary.items():
+            self.stdout.write(
+                f'{route:<50}{stats["requests"]:>9}{stats["errors"]:>8}'
+                f'{stats["mismatches"]:>10}{stats["p50_ms"]:>10.2f}'
+                f'{stats["p95_ms"]:>10.2f}{stats["p99_ms"]:>10.2f}'
+            )
+
+    def handle(self, *args, **options):
+        if options['speed'] < 0:
+            raise CommandError('Параметр --speed не может быть меньше 0')
+        if options['concurrency'] < 1:
+            raise CommandError('Параметр --concurrency должен быть больше 0')
+        if options['concurrency'] > 1 and not options['url']:
+            raise CommandError(
+                'Параллельные запросы поддерживаются только в режиме --url'
+            )
+        entries = self.read_entries(options['path'], options['limit'])
+        self.tokens = self.get_tokens(entries)
+        if options['url']:
+            transport = HttpTransport(options['url'])
+        else:
+            transport = InProcessTransport()
+        started = time.perf_counter()
+        with transport:
+            results = self.replay(
+                transport, entries, options['speed'], options['concurrency']
+            )
+        summary = self.summarize(results, time.perf_counter() - started)
+        self.report(summary)
+        if options['output']:
+            Path(options['output']).write_text(json.dumps({
+                'source': str(options['path']),
+                'mode': 'http' if options['url'] else 'in-process',
+                'speed': options['speed'],
+                'concurrency': options['concurrency'],
+                'routes': summary,
+            }, ensure_ascii=False, indent=2), encoding='utf-8')
+            self.stdout.write(self.style.SUCCESS(
+                f'Результаты сохранены в {options["output"]}'
+            ))
@@ -0,0 +1,77 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_delete
+)
+from django.dispatch import receiver
+
+from api.v1.cache import bump_version, forget_user
+from reviews.models import Category, Genre, Review, Title
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=Review)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Review)
+@receiver(post_delete, sender=User)
+def invalidate_cached_responses(sender, **kwargs):
+    """
+    Сброс закэшированных ответов при изменении данных.
+    Версия меняется после фиксации транзакции, чтобы параллельный
+    запрос не закэшировал под новой версией ещё не изменённые данные.
+    """
+    transaction.on_commit(lambda: bump_version(sender))
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres(sender, instance, action, reverse, pk_set,
+                            **kwargs):
+    """
+    Сброс закэшированных произведений при изменении их жанров.
+    Время изменения произведений обновляется, чтобы изменился
+    и ETag ответов с ними.
+    """
+    if reverse and action == 'pre_clear':
+        Title.objects.filter(genre=instance).update()
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        Title.objects.filter(pk=instance.pk).update()
+    elif pk_set:
+        Title.objects.filter(pk__in=pk_set).update()
+    transaction.on_commit(lambda: bump_version(Title))
+
+
+@receiver(post_save, sender=Genre)
+@receiver(pre_delete, sender=Genre)
+def touch_genre_titles(sender, instance, **kwargs):
+    """
+    Обновление времени изменения произведений жанра: название и слаг
+    жанра входят в ответ с произведением и в его ETag.
+    """
+    Title.objects.filter(genre=instance).update()
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def touch_category_titles(sender, instance, **kwargs):
+    """Обновление времени изменения произведений категории."""
+    Title.objects.filter(category=instance).update()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """
+    Сброс закэшированного пользователя при изменении роли или удалении
+    после фиксации транзакции, как и сброс закэшированных ответов.
+    """
+    pk = instance.pk
+    transaction.on_commit(lambda: forget_user(pk))
@@ -0,0 +1,25 @@
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from api.v1 import cache
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    Аутентификация по JWT-токену с кэшированием пользователя.
+    Запись сбрасывается при изменении или удалении пользователя,
+    а в остальных случаях живёт не дольше USER_CACHE_TIMEOUT секунд.
+    """
+
+    def get_user(self, validated_token):
+        key = cache.get_user_key(
+            validated_token.get(api_settings.USER_ID_CLAIM)
+        )
+        user = cache.get_user_cache().get(key)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.get_user_cache().set(
+                key, user, settings.USER_CACHE_TIMEOUT
+            )
+        return user
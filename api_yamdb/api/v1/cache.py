@@ -0,0 +1,101 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+
+from core.metrics import registry
+
+VERSION_KEY_TEMPLATE = 'api:version:{label}'
+
+RESPONSE_KEY_TEMPLATE = 'api:response:{path}:{versions}'
+
+USER_KEY_TEMPLATE = 'api:user:{pk}'
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def get_cache():
+    """Бэкенд кэша ответов API."""
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def count_event(event):
+    """Учёт попаданий, промахов и инвалидаций кэша."""
+    with _stats_lock:
+        _stats[event] += 1
+    registry.inc('api_response_cache_total', event=event)
+
+
+def get_stats():
+    """Статистика кэша ответов текущего процесса."""
+    with _stats_lock:
+        stats = {
+            event: _stats[event]
+            for event in ('hits', 'misses', 'invalidations')
+        }
+    requests = stats['hits'] + stats['misses']
+    stats['hit_ratio'] = stats['hits'] / requests if requests else 0.0
+    return stats
+
+
+def get_version_key(model):
+    return VERSION_KEY_TEMPLATE.format(label=model._meta.label_lower)
+
+
+def get_versions(models):
+    """
+    Текущие версии данных моделей.
+    Версия, вытесненная из кэша, заново начинается с текущего времени,
+    чтобы не совпасть ни с одной из прежних.
+    """
+    cache = get_cache()
+    keys = [get_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return '.'.join(str(versions[key]) for key in keys)
+
+
+def bump_version(model):
+    """Инвалидация всех закэшированных ответов, зависящих от модели."""
+    cache = get_cache()
+    key = get_version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+    count_event('invalidations')
+
+
+def get_response_key(path, models, state=None):
+    """
+    Ключ ответа по полному пути с параметрами, версиям данных
+    и ETag ответа, построенному по базе данных.
+    """
+    return RESPONSE_KEY_TEMPLATE.format(
+        path=hashlib.sha1(f'{path}:{state!r}'.encode()).hexdigest(),
+        versions=get_versions(models),
+    )
+
+
+def get_user_cache():
+    """
+    Бэкенд кэша аутентификации, общий для всех процессов сервера:
+    сброс записи пользователя должен доходить до каждого из них.
+    """
+    return caches[settings.USER_CACHE_ALIAS]
+
+
+def get_user_key(pk):
+    return USER_KEY_TEMPLATE.format(pk=pk)
+
+
+def forget_user(pk):
+    """Удаление пользователя из кэша аутентификации."""
+    get_user_cache().delete(get_user_key(pk))
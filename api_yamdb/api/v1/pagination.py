@@ -0,0 +1,63 @@
+from rest_framework import pagination
+
+from core import constants as const
+
+
+class LimitOffsetPagination(pagination.LimitOffsetPagination):
+    """
+    Пагинация по смещению с ограничением размера страницы.
+    Количество объектов, уже подсчитанное вьюсетом для ETag
+    (`list_count`), повторно не запрашивается.
+    """
+
+    max_limit = const.MAX_PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.view = view
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_count(self, queryset):
+        count = getattr(self.view, 'list_count', None)
+        if count is None:
+            return super().get_count(queryset)
+        return count
+
+
+class CursorPagination(pagination.CursorPagination):
+    """
+    Курсорная пагинация без подсчёта общего количества объектов.
+    Размер страницы задаётся тем же параметром `limit`.
+    """
+
+    page_size_query_param = 'limit'
+    max_page_size = const.MAX_PAGE_SIZE
+
+
+class OptionalCursorPagination(LimitOffsetPagination):
+    """
+    Пагинация по смещению, а при наличии параметра `cursor` - курсорная.
+    Курсор строится по атрибуту `ordering` вьюсета, который должен
+    завершаться уникальным полем.
+    """
+
+    cursor_query_param = 'cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param not in request.query_params:
+            self.cursor_paginator = None
+            return super().paginate_queryset(queryset, request, view)
+        self.cursor_paginator = CursorPagination()
+        self.cursor_paginator.ordering = view.ordering
+        return self.cursor_paginator.paginate_queryset(
+            queryset, request, view
+        )
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is None:
+            return super().get_paginated_response(data)
+        return self.cursor_paginator.get_paginated_response(data)
+
+    def get_html_context(self):
+        if self.cursor_paginator is None:
+            return super().get_html_context()
+        return self.cursor_paginator.get_html_context()
@@ -9,7 +9,12 @@ class TitleFilter(FilterSet):
     category = CharFilter(field_name='category__slug')
     genre = CharFilter(field_name='genre__slug')
     name = CharFilter(field_name='name', lookup_expr='contains')
+    search = CharFilter(method='filter_search')
 
     class Meta:
         model = Title
-        fields = ('name', 'category', 'genre', 'year')
+        fields = ('name', 'category', 'genre', 'year', 'search')
+
+    def filter_search(self, queryset, name, value):
+        """Полнотекстовый поиск с сортировкой по релевантности."""
+        return queryset.search(value)
@@ -1,9 +1,225 @@
-from rest_framework import filters, mixins, response, viewsets
+import hashlib
+import time
 
+from django.conf import settings
+from django.db.models import Count, Max
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import filters, mixins, response, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.utils.encoders import JSONEncoder
+
+from api.v1 import cache
 from api.v1.permissions import IsAdminOrReadOnly
+from core import constants as const
+
+
+def get_field_value(instance, lookup):
+    """Значение поля объекта или связанного объекта по пути с `__`."""
+    for name in lookup.split('__'):
+        if instance is None:
+            return None
+        instance = getattr(instance, name)
+    return instance
+
+
+class TimedSerializer:
+    """
+    Обёртка сериализатора, учитывающая время получения `data`
+    в `serialize_time` замеров запроса. Остальные атрибуты
+    берутся из самого сериализатора.
+    """
+
+    def __init__(self, serializer, timing):
+        self.serializer = serializer
+        self.timing = timing
+
+    def __getattr__(self, name):
+        return getattr(self.serializer, name)
+
+    @property
+    def data(self):
+        started = time.perf_counter()
+        try:
+            return self.serializer.data
+        finally:
+            self.timing.serialize_time += time.perf_counter() - started
+
+
+class SerializerTimingMixin:
+    """
+    Миксин замера времени сериализации ответа отдельно от его отрисовки,
+    если подключён RequestTimingMiddleware.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        timing = getattr(self.request, 'timing', None)
+        if timing is None:
+            return serializer
+        return TimedSerializer(serializer, timing)
+
+
+class CachedResponseMixin:
+    """
+    Миксин кэширования ответов на GET-запросы.
+    Ответ сбрасывается при изменении любой из моделей `cache_models`
+    и при изменении ETag, построенного по объектам ответа.
+    """
+
+    cache_models = ()
+    etag = None
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        key = cache.get_response_key(
+            request.get_full_path(), self.cache_models, self.etag
+        )
+        data = cache.get_cache().get(key)
+        if data is not None:
+            cache.count_event('hits')
+            cached_response = response.Response(data)
+            cached_response['X-Cache'] = 'HIT'
+            return cached_response
+        cache.count_event('misses')
+        handler_response = handler(request, *args, **kwargs)
+        if handler_response.status_code == status.HTTP_200_OK:
+            cache.get_cache().set(
+                key, handler_response.data, settings.RESPONSE_CACHE_TIMEOUT
+            )
+        handler_response['X-Cache'] = 'MISS'
+        return handler_response
+
+
+class ConditionalResponseMixin(CachedResponseMixin):
+    """
+    Миксин условных GET-запросов с заголовками ETag и Last-Modified.
+    Валидаторы строятся до сериализации по объектам ответа:
+    по их количеству и последнему значению `last_modified_field`,
+    а также по времени изменения связанных объектов из
+    `related_modified_fields`, например авторов. Количество объектов
+    списка используется и пагинацией вместо отдельного запроса.
+    Список проверяется только по ETag, так как удаление объекта
+    не меняет время последнего изменения.
+    """
+
+    last_modified_field = 'updated_at'
+    related_modified_fields = ()
+    list_count = None
+
+    def get_object(self):
+        if not hasattr(self, '_object'):
+            self._object = super().get_object()
+        return self._object
+
+    def check_empty_list(self):
+        """
+        Проверка пустого списка до сравнения ETag: вложенные вьюсеты
+        проверяют здесь существование родительского объекта, чтобы
+        после его удаления ответом был 404, а не 304.
+        """
+
+    def get_validators(self, request):
+        """Вычисление ETag и времени последнего изменения ответа."""
+        fields = (self.last_modified_field, *self.related_modified_fields)
+        if self.action == 'retrieve':
+            instance = self.get_object()
+            values = [get_field_value(instance, field) for field in fields]
+            parts = [instance.pk]
+        else:
+            state = self.filter_queryset(
+                self.get_queryset()
+            ).order_by().aggregate(
+                Count('pk'), *(Max(field) for field in fields)
+            )
+            self.list_count = state.pop('pk__count')
+            if not self.list_count:
+                self.check_empty_list()
+            values = [state[f'{field}__max'] for field in fields]
+            parts = [self.list_count]
+        parts.extend((request.get_full_path(), *values))
+        etag = quote_etag(hashlib.sha1(repr(parts).encode()).hexdigest())
+        last_modified = max(filter(None, values), default=None)
+        if last_modified is not None:
+            last_modified = int(last_modified.timestamp())
+        return etag, last_modified
+
+    def get_conditional_response(self, handler, request, *args, **kwargs):
+        self.etag, last_modified = self.get_validators(request)
+        result = get_conditional_response(
+            request,
+            etag=self.etag,
+            last_modified=(
+                last_modified if self.action == 'retrieve' else None
+            ),
+        )
+        if result is None:
+            if self.cache_models:
+                result = self.get_cached_response(
+                    handler, request, *args, **kwargs
+                )
+            else:
+                result = handler(request, *args, **kwargs)
+            if result.status_code != status.HTTP_200_OK:
+                return result
+        result['ETag'] = self.etag
+        if last_modified is not None:
+            result['Last-Modified'] = http_date(last_modified)
+        return result
+
+
+class ConditionalListMixin(ConditionalResponseMixin):
+    """Миксин условного GET-запроса и кэширования списка объектов."""
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class ConditionalRetrieveMixin(ConditionalResponseMixin):
+    """Миксин условного GET-запроса и кэширования отдельного объекта."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class StreamingExportMixin:
+    """
+    Миксин потоковой выгрузки объектов в формате NDJSON.
+    Объекты читаются из базы данных частями по `export_chunk_size`
+    и сериализуются по одному, не собирая весь список в памяти.
+    """
+
+    export_chunk_size = const.EXPORT_CHUNK_SIZE
+
+    def get_export_queryset(self):
+        return self.filter_queryset(self.get_queryset()).order_by('pk')
+
+    def stream_export(self, queryset):
+        serializer = self.get_serializer()
+        encoder = JSONEncoder(ensure_ascii=False)
+        for instance in queryset.iterator(chunk_size=self.export_chunk_size):
+            data = serializer.to_representation(instance)
+            yield f'{encoder.encode(data)}\n'
+
+    @action(detail=False,
+            methods=('get',),
+            url_path='export',
+            url_name='export')
+    def export(self, request, *args, **kwargs):
+        """Потоковая выгрузка всех объектов по одному JSON на строку."""
+        return StreamingHttpResponse(
+            self.stream_export(self.get_export_queryset()),
+            content_type='application/x-ndjson'
+        )
 
 
 class GenreCategoryMixin(
+    ConditionalListMixin,
+    SerializerTimingMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     mixins.DestroyModelMixin,
@@ -38,6 +254,7 @@ class PatchModelMixin:
 
 
 class CreateListDestroyPatchMixin(
+    SerializerTimingMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
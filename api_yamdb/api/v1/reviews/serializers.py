@@ -1,13 +1,16 @@
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 from rest_framework import serializers
-from rest_framework.validators import UniqueTogetherValidator
+from rest_framework.settings import api_settings
 
 from core import constants as const
 from reviews.models import Category, Comments, Genre, Review, Title
 
 User = get_user_model()
 
+REVIEW_EXISTS_MESSAGE = 'Вы уже оставили отзыв!'
+
 
 class CategorySerializer(serializers.ModelSerializer):
     """Сериализатор для категорий."""
@@ -89,7 +92,7 @@ class CommentSerializer(AuthorMixin, serializers.ModelSerializer):
     """Сериализатор комментариев."""
 
     class Meta:
-        fields = '__all__'
+        exclude = ('updated_at',)
         model = Comments
         read_only_fields = ('review', 'author')
 
@@ -98,20 +101,26 @@ class ReviewSerializer(AuthorMixin, serializers.ModelSerializer):
     """Сериализатор отзывов."""
 
     class Meta:
-        fields = '__all__'
+        exclude = ('updated_at',)
         model = Review
         read_only_fields = ('title', 'author')
 
-        validators = [
-            UniqueTogetherValidator(
-                queryset=Review.objects.all(),
-                fields=('author', 'title'),
-                message='Вы уже оставили отзыв!'
-            )
-        ]
-
-    def to_internal_value(self, data):
-        """Добавление произведения для последующей проверки в валидаторе."""
-        data = super().to_internal_value(data)
-        data['title'] = self.context['view'].title_for_reviews()
-        return data
+    def create(self, validated_data):
+        """
+        Создание отзыва, уникальность которого проверяет ограничение
+        unique_review в базе данных, а не отдельный запрос.
+        Другие ошибки целостности не подменяются сообщением о повторном
+        отзыве: существование отзыва проверяется только после ошибки.
+        """
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            if not Review.objects.filter(
+                author=validated_data['author'],
+                title=validated_data['title']
+            ).exists():
+                raise
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [REVIEW_EXISTS_MESSAGE]
+            })
@@ -22,6 +22,16 @@ router_reviews_v1.register(
     views.CommentViewSet,
     basename='comments'
 )
+router_reviews_v1.register(
+    'reviews',
+    views.ReviewExportViewSet,
+    basename='reviews-export'
+)
+router_reviews_v1.register(
+    'comments',
+    views.CommentExportViewSet,
+    basename='comments-export'
+)
 
 urlpatterns = [
     path('', include(router_reviews_v1.urls)),
@@ -1,14 +1,16 @@
-from django.db.models import Avg
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import viewsets
 
 from api.v1 import permissions
+from api.v1.pagination import OptionalCursorPagination
 from api.v1.reviews import serializers
 from api.v1.reviews.filters import TitleFilter
 from api.v1.reviews.mixins import (
-    CreateListDestroyPatchMixin, GenreCategoryMixin
+    ConditionalListMixin, ConditionalRetrieveMixin,
+    CreateListDestroyPatchMixin, GenreCategoryMixin, StreamingExportMixin
 )
-from reviews.models import Category, Genre, Title, Review
+from reviews.models import Category, Comments, Genre, Title, Review
 
 
 class GenreViewSet(GenreCategoryMixin):
@@ -16,6 +18,7 @@ class GenreViewSet(GenreCategoryMixin):
 
     queryset = Genre.objects.all()
     serializer_class = serializers.GenreSerializer
+    cache_models = (Genre,)
 
 
 class CategoryViewSet(GenreCategoryMixin):
@@ -23,15 +26,23 @@ class CategoryViewSet(GenreCategoryMixin):
 
     queryset = Category.objects.all()
     serializer_class = serializers.CategorySerializer
+    cache_models = (Category,)
 
 
-class TitleViewSet(CreateListDestroyPatchMixin):
+class TitleViewSet(
+    ConditionalListMixin, ConditionalRetrieveMixin, CreateListDestroyPatchMixin
+):
     """Вьюсет для произведений."""
 
     permission_classes = (permissions.IsAdminOrReadOnly,)
-    queryset = Title.objects.annotate(rating=Avg('reviews__score'))
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre')
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
+    pagination_class = OptionalCursorPagination
+    ordering = ('name', 'id')
+    cache_models = (Title, Genre, Category, Review)
 
     def get_serializer_class(self):
         """Выбор сериализатора в зависимости от типа запроса."""
@@ -40,19 +51,49 @@ class TitleViewSet(CreateListDestroyPatchMixin):
         return serializers.TitleEditSerializer
 
 
-class ReviewViewSet(CreateListDestroyPatchMixin):
+class ReviewViewSet(
+    StreamingExportMixin,
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    CreateListDestroyPatchMixin,
+):
     """Вьюсет отзывов."""
 
     serializer_class = serializers.ReviewSerializer
     permission_classes = (permissions.IsModeratorOrAdminOrReadOnly,)
+    pagination_class = OptionalCursorPagination
+    ordering = ('-pub_date', '-id')
+    related_modified_fields = ('author__updated_at',)
 
     def title_for_reviews(self):
-        """Получение объекта произведения."""
-        return get_object_or_404(Title, pk=self.kwargs.get('title_id'))
+        """Получение объекта произведения один раз за запрос."""
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(
+                Title, pk=self.kwargs.get('title_id')
+            )
+        return self._title
 
     def get_queryset(self):
-        """Запрос отзывов на произведение."""
-        return self.title_for_reviews().reviews.all()
+        """
+        Запрос отзывов на произведение без отдельного запроса к нему:
+        существование произведения проверяется только для пустой страницы.
+        """
+        return Review.objects.filter(
+            title=self.kwargs.get('title_id')
+        ).select_related('author')
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if not page:
+            self.title_for_reviews()
+        return page
+
+    def check_empty_list(self):
+        self.title_for_reviews()
+
+    def get_export_queryset(self):
+        self.title_for_reviews()
+        return super().get_export_queryset()
 
     def perform_create(self, serializer):
         """Создание отзыва с сохранением автора и произведения."""
@@ -62,23 +103,52 @@ class ReviewViewSet(CreateListDestroyPatchMixin):
         )
 
 
-class CommentViewSet(CreateListDestroyPatchMixin):
+class CommentViewSet(
+    StreamingExportMixin,
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    CreateListDestroyPatchMixin,
+):
     """Вьюсет комментариев."""
 
     serializer_class = serializers.CommentSerializer
     permission_classes = (permissions.IsModeratorOrAdminOrReadOnly,)
+    pagination_class = OptionalCursorPagination
+    ordering = ('-pub_date', '-id')
+    related_modified_fields = ('author__updated_at',)
 
     def commented_review(self):
-        """Получение объекта комментария."""
-        return get_object_or_404(
-            Review,
-            pk=self.kwargs.get('review_id'),
-            title=self.kwargs.get('title_id')
-        )
+        """Получение объекта отзыва один раз за запрос."""
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review,
+                pk=self.kwargs.get('review_id'),
+                title=self.kwargs.get('title_id')
+            )
+        return self._review
 
     def get_queryset(self):
-        """Запрос комментариев на отзыв."""
-        return self.commented_review().comments.all()
+        """
+        Запрос комментариев на отзыв без отдельного запроса к нему:
+        существование отзыва проверяется только для пустой страницы.
+        """
+        return Comments.objects.filter(
+            review=self.kwargs.get('review_id'),
+            review__title=self.kwargs.get('title_id')
+        ).select_related('author')
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if not page:
+            self.commented_review()
+        return page
+
+    def check_empty_list(self):
+        self.commented_review()
+
+    def get_export_queryset(self):
+        self.commented_review()
+        return super().get_export_queryset()
 
     def perform_create(self, serializer):
         """Создание комментария с сохранением автора и отзыва."""
@@ -86,3 +156,19 @@ class CommentViewSet(CreateListDestroyPatchMixin):
             author=self.request.user,
             review=self.commented_review()
         )
+
+
+class ReviewExportViewSet(StreamingExportMixin, viewsets.GenericViewSet):
+    """Потоковая выгрузка отзывов на все произведения для администратора."""
+
+    queryset = Review.objects.select_related('author')
+    serializer_class = serializers.ReviewSerializer
+    permission_classes = (permissions.IsAdmin,)
+
+
+class CommentExportViewSet(StreamingExportMixin, viewsets.GenericViewSet):
+    """Потоковая выгрузка всех комментариев для администратора."""
+
+    queryset = Comments.objects.select_related('author')
+    serializer_class = serializers.CommentSerializer
+    permission_classes = (permissions.IsAdmin,)
@@ -0,0 +1,154 @@
+import sqlite3
+import threading
+
+from django.conf import settings
+from rest_framework.throttling import SimpleRateThrottle
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS throttle_hits ('
+    'key TEXT NOT NULL, period INTEGER NOT NULL, hits INTEGER NOT NULL, '
+    'PRIMARY KEY (key, period)) WITHOUT ROWID'
+)
+
+
+class SlidingWindowStore:
+    """
+    Счётчики запросов в файле SQLite, общие для всех процессов сервера.
+    Каждое обращение выполняется в транзакции BEGIN IMMEDIATE, поэтому
+    проверка лимита и учёт запроса атомарны и между процессами.
+    Ключ счётчика начинается с длительности окна, и раз в окно
+    удаляются устаревшие счётчики всех ключей с этой длительностью,
+    в том числе ключей, по которым запросов больше не было.
+    """
+
+    def __init__(self):
+        self.local = threading.local()
+        self.purged = {}
+
+    def get_connection(self):
+        path = str(settings.THROTTLE_STORE_PATH)
+        if getattr(self.local, 'path', None) != path:
+            connection = sqlite3.connect(
+                path, timeout=settings.THROTTLE_STORE_TIMEOUT,
+                isolation_level=None
+            )
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(SCHEMA)
+            self.local.connection, self.local.path = connection, path
+        return self.local.connection
+
+    def hit(self, keys, limit, duration, now):
+        """
+        Учёт запроса по всем ключам, если ни по одному из них
+        не превышен лимит. Число запросов за скользящее окно
+        оценивается по счётчикам текущего и предыдущего окна.
+        """
+        period, offset = divmod(now, duration)
+        period = int(period)
+        keys = [f'{duration}:{key}' for key in keys]
+        connection = self.get_connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            if self.purged.get(duration) != period:
+                self.purge(connection, duration, period)
+            allowed = self.count(
+                connection, keys, limit, period, 1 - offset / duration
+            )
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+        self.purged[duration] = period
+        return allowed
+
+    def purge(self, connection, duration, period):
+        """Удаление счётчиков окон длительностью duration до предыдущего."""
+        connection.execute(
+            'DELETE FROM throttle_hits '
+            'WHERE key >= ? AND key < ? AND period < ?',
+            (f'{duration}:', f'{duration};', period - 1)
+        )
+
+    def count(self, connection, keys, limit, period, previous_weight):
+        for key in keys:
+            counts = dict(connection.execute(
+                'SELECT period, hits FROM throttle_hits '
+                'WHERE key = ? AND period >= ?',
+                (key, period - 1)
+            ))
+            estimate = (
+                counts.get(period - 1, 0) * previous_weight
+                + counts.get(period, 0)
+            )
+            if estimate + 1 > limit:
+                return False
+        for key in keys:
+            connection.execute(
+                'INSERT INTO throttle_hits (key, period, hits) '
+                'VALUES (?, ?, 1) ON CONFLICT (key, period) '
+                'DO UPDATE SET hits = hits + 1',
+                (key, period)
+            )
+        return True
+
+
+store = SlidingWindowStore()
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Ограничение частоты запросов по скользящему окну.
+    Лимит `scope` из DEFAULT_THROTTLE_RATES действует для каждого
+    из ключей `get_cache_keys`, счётчики хранятся в `store`.
+    Все ограничения снимаются настройкой THROTTLING_ENABLED.
+    """
+
+    def get_cache_keys(self, request, view):
+        key = self.get_cache_key(request, view)
+        return [key] if key is not None else []
+
+    def allow_request(self, request, view):
+        if self.rate is None or not settings.THROTTLING_ENABLED:
+            return True
+        keys = self.get_cache_keys(request, view)
+        if not keys:
+            return True
+        self.now = self.timer()
+        return store.hit(keys, self.num_requests, self.duration, self.now)
+
+    def wait(self):
+        """Время до начала следующего окна."""
+        return self.duration - self.now % self.duration
+
+
+class AuthRateThrottle(SlidingWindowThrottle):
+    """Ограничение запросов регистрации и получения токена по IP-адресу."""
+
+    scope = 'auth'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': self.get_ident(request),
+        }
+
+
+class AuthIdentityThrottle(SlidingWindowThrottle):
+    """
+    Ограничение запросов регистрации и получения токена
+    по имени пользователя и по email из тела запроса.
+    """
+
+    scope = 'auth_identity'
+
+    def get_cache_keys(self, request, view):
+        if not isinstance(request.data, dict):
+            return []
+        return [
+            self.cache_format % {
+                'scope': self.scope,
+                'ident': f'{field}:{request.data[field]}',
+            }
+            for field in ('username', 'email')
+            if request.data.get(field)
+        ]
@@ -1,6 +1,9 @@
 from django.urls import include, path
 
+from api.v1 import views
+
 urlpatterns = [
+    path('metrics/', views.metrics, name='metrics'),
     path('', include('api.v1.reviews.urls')),
     path('', include('api.v1.users.urls')),
 ]
@@ -1,6 +1,9 @@
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
 
 from api.v1.users.mixins import ValidationUsernameMixin
 from core import constants as const
@@ -37,18 +40,50 @@ class UserCreateSerializer(serializers.Serializer, ValidationUsernameMixin):
     )
 
     def validate(self, data):
-        """Проверка на доступность username и emeil."""
+        """
+        Проверка на доступность username и emeil одним запросом.
+        Найденный пользователь с такими же username и email запоминается,
+        чтобы не запрашивать его повторно при сохранении.
+        """
         email = data.get('email')
         username = data.get('username')
-        if not User.objects.filter(username=username, email=email).exists():
-            if User.objects.filter(username=username):
+        users = list(User.objects.filter(
+            Q(username=username) | Q(email=email)
+        )[:2])
+        self.user = next((
+            user for user in users
+            if user.username == username and user.email == email
+        ), None)
+        if self.user is None and users:
+            if any(user.username == username for user in users):
                 raise ValidationError(
                     'Пользователь с таким именем уже существует'
                 )
-            if User.objects.filter(email=email):
-                raise ValidationError('Пользователь с таким email существует')
+            raise ValidationError('Пользователь с таким email существует')
         return data
 
+    def create(self, validated_data):
+        """
+        Получение пользователя, найденного при проверке, или создание нового.
+        Если того же пользователя одновременно создал другой запрос,
+        проверка повторяется по уже сохранённым данным.
+        """
+        if self.user is not None:
+            return self.user
+        try:
+            with transaction.atomic():
+                return User.objects.create(**validated_data)
+        except IntegrityError:
+            try:
+                self.validate(validated_data)
+            except ValidationError as e:
+                raise ValidationError(
+                    {api_settings.NON_FIELD_ERRORS_KEY: e.detail}
+                )
+            if self.user is None:
+                raise
+            return self.user
+
 
 class TokenSerializer(serializers.Serializer):
     """Сериализатор для получения токена пользователем."""
@@ -9,6 +9,6 @@ router_users_v1.register('users', views.UserViewSet, basename='users')
 
 urlpatterns = [
     path('', include(router_users_v1.urls)),
-    path('auth/signup/', views.sign_up),
+    path('auth/signup/', views.sign_up, name='sign_up'),
     path('auth/token/', views.check_code, name='check_code'),
 ]
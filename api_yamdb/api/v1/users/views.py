@@ -1,27 +1,32 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
 from django.shortcuts import get_object_or_404
 from rest_framework import status
-from rest_framework.decorators import action, api_view
+from rest_framework.decorators import action, api_view, throttle_classes
 from rest_framework.filters import SearchFilter
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import AccessToken
 
 from api.v1 import permissions
-from api.v1.reviews.mixins import CreateListDestroyPatchMixin
+from api.v1.throttling import AuthIdentityThrottle, AuthRateThrottle
+from api.v1.reviews.mixins import (
+    ConditionalListMixin, ConditionalRetrieveMixin, CreateListDestroyPatchMixin
+)
 from api.v1.users import serializers
 from api_yamdb.settings import EMAIL_DEFAULT_FROM
+from users.models import OutgoingEmail
 
 
 User = get_user_model()
 
 
-class UserViewSet(CreateListDestroyPatchMixin):
+class UserViewSet(
+    ConditionalListMixin, ConditionalRetrieveMixin, CreateListDestroyPatchMixin
+):
     """Вьюсет для работы с пользователями."""
 
-    queryset = User.objects.all()
+    queryset = User.objects.order_by('username')
     serializer_class = serializers.UserSerializer
     permission_classes = (permissions.IsAdmin,)
     filter_backends = (SearchFilter,)
@@ -35,13 +40,13 @@ class UserViewSet(CreateListDestroyPatchMixin):
             permission_classes=(IsAuthenticated,))
     def get_user_data(self, request):
         """Получение данных пользователя."""
-        serializer = serializers.UserSerializer(request.user)
+        serializer = self.get_serializer(request.user)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     @get_user_data.mapping.patch
     def change_user_data(self, request):
         """Редактирование данных пользователя."""
-        serializer = serializers.UserSerializer(
+        serializer = self.get_serializer(
             request.user,
             data=request.data,
             partial=True
@@ -57,28 +62,24 @@ class UserViewSet(CreateListDestroyPatchMixin):
 
 
 @api_view(('POST',))
+@throttle_classes((AuthRateThrottle, AuthIdentityThrottle))
 def sign_up(request):
     """Создание пользователя."""
     serializer = serializers.UserCreateSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
-    username = serializer.validated_data['username']
-    email = serializer.validated_data['email']
-    user, confirmation_code = User.objects.get_or_create(
-        username=username,
-        email=email
-    )
+    user = serializer.save()
     confirmation_code = default_token_generator.make_token(user)
-    send_mail(
+    OutgoingEmail.objects.create(
         subject='Код подтверждения',
         message=f'Ваш код подтверждения: {confirmation_code}',
         from_email=EMAIL_DEFAULT_FROM,
-        recipient_list=(email,),
-        fail_silently=False
+        recipient=user.email,
     )
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 @api_view(('POST',))
+@throttle_classes((AuthRateThrottle, AuthIdentityThrottle))
 def check_code(request):
     """Создание JWT-токена."""
     serializer = serializers.TokenSerializer(data=request.data)
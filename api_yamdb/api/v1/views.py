@@ -0,0 +1,16 @@
+from django.http import HttpResponse
+from rest_framework.decorators import api_view, permission_classes
+
+from api.v1.permissions import IsAdmin
+from core.metrics import collect
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+@api_view(('GET',))
+@permission_classes((IsAdmin,))
+def metrics(request):
+    """Метрики всех процессов сервера в формате Prometheus."""
+    return HttpResponse(
+        collect(), content_type=PROMETHEUS_CONTENT_TYPE
+    )
@@ -26,6 +26,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestTimingMiddleware',
+    'core.middleware.MetricsMiddleware',
+    'core.middleware.TrafficRecordingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -63,6 +66,16 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+    },
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -96,7 +109,7 @@ AUTH_USER_MODEL = 'users.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.v1.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
@@ -105,8 +118,16 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
+    'DEFAULT_PAGINATION_CLASS': 'api.v1.pagination.LimitOffsetPagination',
     'PAGE_SIZE': 10,
+    # IP-адрес клиента для ограничения частоты запросов берётся
+    # из REMOTE_ADDR: заголовок X-Forwarded-For задаёт сам клиент.
+    # За обратным прокси здесь указывается число прокси перед сервером.
+    'NUM_PROXIES': 0,
+    'DEFAULT_THROTTLE_RATES': {
+        'auth': '20/min',
+        'auth_identity': '5/min',
+    },
 }
 
 SIMPLE_JWT = {
@@ -116,3 +137,50 @@ SIMPLE_JWT = {
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = (BASE_DIR / 'emails')
 EMAIL_DEFAULT_FROM = 'yamdb_email@yamdb.ru'
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_DELAY = 60
+EMAIL_OUTBOX_CLAIM_TIMEOUT = 60 * 10
+
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = 60 * 5
+USER_CACHE_ALIAS = 'shared'
+USER_CACHE_TIMEOUT = 60
+
+THROTTLING_ENABLED = True
+THROTTLE_STORE_PATH = BASE_DIR / 'throttle.sqlite3'
+THROTTLE_STORE_TIMEOUT = 5
+
+REQUEST_TIMING_ENABLED = DEBUG
+REQUEST_TIMING_HEADER = True
+REQUEST_TIMING_SLOW_MS = 500
+REQUEST_TIMING_SLOW_QUERIES = 50
+
+METRICS_ENABLED = True
+METRICS_DIR = BASE_DIR / 'metrics'
+METRICS_FLUSH_INTERVAL = 1
+
+TRAFFIC_RECORDING_ENABLED = False
+TRAFFIC_RECORDING_PATH = BASE_DIR / 'traffic.jsonl'
+TRAFFIC_RECORDING_RATE = 0.1
+TRAFFIC_RECORDING_MAX_BODY = 10000
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'message': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'requests': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'message',
+        },
+    },
+    'loggers': {
+        'api_yamdb.requests': {
+            'handlers': ['requests'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
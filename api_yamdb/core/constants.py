@@ -11,3 +11,7 @@ MAX_STR_LENGTH = 25
 MIN_VALUE = 1
 
 MAX_VALUE = 10
+
+MAX_PAGE_SIZE = 100
+
+EXPORT_CHUNK_SIZE = 2000
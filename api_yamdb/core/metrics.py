@@ -0,0 +1,198 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+QUERY_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+METRICS = {
+    'http_requests_total': (
+        'counter', 'Количество обработанных HTTP-запросов'
+    ),
+    'http_request_duration_seconds': (
+        'histogram', 'Время обработки HTTP-запроса'
+    ),
+    'http_request_queries': (
+        'histogram', 'Количество SQL-запросов на HTTP-запрос'
+    ),
+    'api_response_cache_total': (
+        'counter', 'События кэша ответов API'
+    ),
+}
+
+
+class Registry:
+    """
+    Счётчики и гистограммы текущего процесса.
+    Снимок метрик периодически записывается в METRICS_DIR в файл
+    с номером процесса, откуда метрики всех процессов собирает `collect`.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.pid = os.getpid()
+        self.counters = defaultdict(float)
+        self.histograms = {}
+        self.flushed = 0.0
+
+    def check_fork(self):
+        """Процесс, созданный через fork, не наследует метрики родителя."""
+        if self.pid != os.getpid():
+            self.reset()
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.check_fork()
+            self.counters[key] += value
+        self.flush()
+
+    def observe(self, name, value, buckets, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.check_fork()
+            if key not in self.histograms:
+                self.histograms[key] = {
+                    'buckets': list(buckets),
+                    'counts': [0] * len(buckets),
+                    'sum': 0.0,
+                    'count': 0,
+                }
+            histogram = self.histograms[key]
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    histogram['counts'][index] += 1
+                    break
+            histogram['sum'] += value
+            histogram['count'] += 1
+        self.flush()
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'counters': [
+                    [name, dict(labels), value]
+                    for (name, labels), value in self.counters.items()
+                ],
+                'histograms': [
+                    [
+                        name, dict(labels),
+                        {**histogram, 'counts': list(histogram['counts'])}
+                    ]
+                    for (name, labels), histogram in self.histograms.items()
+                ],
+            }
+
+    def flush(self, force=False):
+        """Запись снимка не чаще раза в METRICS_FLUSH_INTERVAL секунд."""
+        now = time.monotonic()
+        if not force and now - self.flushed < settings.METRICS_FLUSH_INTERVAL:
+            return
+        self.flushed = now
+        directory = Path(settings.METRICS_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f'{os.getpid()}.json'
+        temporary_path = path.with_suffix('.tmp')
+        with self.flush_lock:
+            temporary_path.write_text(json.dumps(self.snapshot()))
+            os.replace(temporary_path, path)
+
+
+registry = Registry()
+
+
+def format_value(value):
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+def format_labels(labels, **extra):
+    labels = {**labels, **extra}
+    if not labels:
+        return ''
+    escaped = (
+        '{}="{}"'.format(
+            name,
+            str(value).replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n')
+        )
+        for name, value in sorted(labels.items())
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+def merge_snapshots(directory):
+    """Суммирование снимков метрик всех процессов."""
+    counters = defaultdict(float)
+    histograms = {}
+    for path in Path(directory).glob('*.json'):
+        try:
+            snapshot = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        for name, labels, value in snapshot['counters']:
+            counters[(name, tuple(sorted(labels.items())))] += value
+        for name, labels, histogram in snapshot['histograms']:
+            key = (name, tuple(sorted(labels.items())))
+            if key not in histograms:
+                histograms[key] = {
+                    'buckets': histogram['buckets'],
+                    'counts': [0] * len(histogram['buckets']),
+                    'sum': 0.0,
+                    'count': 0,
+                }
+            merged = histograms[key]
+            merged['counts'] = [
+                total + count
+                for total, count in zip(merged['counts'], histogram['counts'])
+            ]
+            merged['sum'] += histogram['sum']
+            merged['count'] += histogram['count']
+    return counters, histograms
+
+
+def collect():
+    """Метрики всех процессов в текстовом формате Prometheus."""
+    registry.flush(force=True)
+    counters, histograms = merge_snapshots(settings.METRICS_DIR)
+    samples = defaultdict(list)
+    for (name, labels), value in sorted(counters.items()):
+        samples[name].append(
+            f'{name}{format_labels(dict(labels))} {format_value(value)}'
+        )
+    for (name, labels), histogram in sorted(histograms.items()):
+        labels = dict(labels)
+        cumulative = 0
+        for bound, count in zip(histogram['buckets'], histogram['counts']):
+            cumulative += count
+            samples[name].append(
+                f'{name}_bucket{format_labels(labels, le=f"{bound:g}")} '
+                f'{cumulative}'
+            )
+        samples[name].extend((
+            f'{name}_bucket{format_labels(labels, le="+Inf")} '
+            f'{histogram["count"]}',
+            f'{name}_sum{format_labels(labels)} '
+            f'{format_value(histogram["sum"])}',
+            f'{name}_count{format_labels(labels)} {histogram["count"]}',
+        ))
+    lines = []
+    for name, (metric_type, description) in METRICS.items():
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {metric_type}')
+        lines.extend(samples.pop(name, ()))
+    for name, metric_samples in samples.items():
+        lines.append(f'# TYPE {name} untyped')
+        lines.extend(metric_samples)
+    return '\n'.join(lines) + '\n'
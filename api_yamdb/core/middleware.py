@@ -0,0 +1,275 @@
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from core.metrics import LATENCY_BUCKETS, QUERY_BUCKETS, registry
+
+logger = logging.getLogger('api_yamdb.requests')
+
+
+def call_after_streaming(response, callback):
+    """
+    Вызов `callback` после отправки тела потокового ответа,
+    в том числе прерванной клиентом.
+    """
+    content = response.streaming_content
+
+    def stream():
+        try:
+            yield from content
+        finally:
+            callback()
+
+    response.streaming_content = stream()
+
+
+class RequestTiming:
+    """Запросы к базе данных и время обработки одного HTTP-запроса."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.render_time = 0.0
+        self.total_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+
+    def finish(self):
+        self.total_time = time.perf_counter() - self.started
+
+    def get_server_timing(self):
+        return (
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries", '
+            f'serialize;dur={self.serialize_time * 1000:.1f}, '
+            f'render;dur={self.render_time * 1000:.1f}, '
+            f'total;dur={self.total_time * 1000:.1f}'
+        )
+
+    def as_dict(self):
+        return {
+            'queries': self.queries,
+            'db_ms': round(self.db_time * 1000, 1),
+            'serialize_ms': round(self.serialize_time * 1000, 1),
+            'render_ms': round(self.render_time * 1000, 1),
+            'total_ms': round(self.total_time * 1000, 1),
+        }
+
+
+class RequestTimingMiddleware:
+    """
+    Учёт SQL-запросов, времени базы данных, сериализации и отрисовки
+    ответа DRF и полного времени обработки запроса.
+    Метрики отдаются в заголовке Server-Timing, а запросы, превысившие
+    REQUEST_TIMING_SLOW_MS или REQUEST_TIMING_SLOW_QUERIES,
+    записываются в журнал строкой JSON. При выключенном
+    REQUEST_TIMING_ENABLED middleware не подключается.
+    Запросы к базе данных при отправке тела потокового ответа
+    учитываются в журнале, но не в заголовке, отправленном до тела.
+    """
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_TIMING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timing = RequestTiming()
+        request.timing = timing
+        with self.count_queries(timing):
+            response = self.get_response(request)
+        timing.finish()
+        if settings.REQUEST_TIMING_HEADER:
+            response['Server-Timing'] = timing.get_server_timing()
+        if response.streaming:
+            self.wrap_streaming(request, response, timing)
+        else:
+            self.log(request, response, timing)
+        return response
+
+    def count_queries(self, timing):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(timing))
+        return stack
+
+    def wrap_streaming(self, request, response, timing):
+        """Учёт запросов, выполняемых при чтении тела ответа."""
+        content = response.streaming_content
+
+        def stream():
+            try:
+                with self.count_queries(timing):
+                    yield from content
+            finally:
+                timing.finish()
+                self.log(request, response, timing)
+
+        response.streaming_content = stream()
+
+    def log(self, request, response, timing):
+        if self.is_slow(timing):
+            logger.warning(json.dumps({
+                'method': request.method,
+                'path': request.get_full_path(),
+                'status': response.status_code,
+                **timing.as_dict(),
+            }, ensure_ascii=False))
+
+    def is_slow(self, timing):
+        return (
+            timing.total_time * 1000 >= settings.REQUEST_TIMING_SLOW_MS
+            or timing.queries >= settings.REQUEST_TIMING_SLOW_QUERIES
+        )
+
+    def process_template_response(self, request, response):
+        """Замер времени отрисовки ответа DRF в JSON."""
+        started = time.perf_counter()
+
+        def stop_timer(response):
+            request.timing.render_time += time.perf_counter() - started
+
+        response.add_post_render_callback(stop_timer)
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Учёт количества и времени HTTP-запросов по имени маршрута, методу
+    и статусу ответа. Если подключён RequestTimingMiddleware, учитывается
+    и количество SQL-запросов. Отключается настройкой METRICS_ENABLED.
+    """
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        if response.streaming:
+            call_after_streaming(
+                response, lambda: self.observe(request, response, started)
+            )
+        else:
+            self.observe(request, response, started)
+        return response
+
+    def observe(self, request, response, started):
+        duration = time.perf_counter() - started
+        match = request.resolver_match
+        labels = {
+            'route': match.view_name if match else 'unmatched',
+            'method': request.method,
+            'status': response.status_code,
+        }
+        registry.inc('http_requests_total', **labels)
+        registry.observe(
+            'http_request_duration_seconds', duration, LATENCY_BUCKETS,
+            **labels
+        )
+        timing = getattr(request, 'timing', None)
+        if timing is not None:
+            registry.observe(
+                'http_request_queries', timing.queries, QUERY_BUCKETS,
+                **labels
+            )
+
+
+SECRET_FIELDS = ('confirmation_code', 'password', 'token', 'refresh')
+
+traffic_lock = threading.Lock()
+
+
+def anonymize(value):
+    """Устойчивый обезличенный идентификатор значения."""
+    return hashlib.sha256(
+        f'{settings.SECRET_KEY}:{value}'.encode()
+    ).hexdigest()[:12]
+
+
+def sanitize_body(request):
+    """
+    Тело запроса JSON без секретов: коды подтверждения и токены
+    заменяются звёздочками, email - обезличенным адресом.
+    """
+    length = int(request.META.get('CONTENT_LENGTH') or 0)
+    if request.content_type != 'application/json' or not length:
+        return None
+    if length > settings.TRAFFIC_RECORDING_MAX_BODY:
+        return None
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return None
+    if isinstance(data, dict):
+        for field in SECRET_FIELDS:
+            if field in data:
+                data[field] = '***'
+        if isinstance(data.get('email'), str):
+            data['email'] = f'{anonymize(data["email"])}@example.com'
+    return data
+
+
+class TrafficRecordingMiddleware:
+    """
+    Запись доли TRAFFIC_RECORDING_RATE запросов к API в файл
+    TRAFFIC_RECORDING_PATH строками JSON для команды `replay_traffic`.
+    Сохраняются время, метод, путь, строка запроса, очищенное тело,
+    роль и обезличенный идентификатор пользователя, статус ответа.
+    Включается настройкой TRAFFIC_RECORDING_ENABLED.
+    """
+
+    def __init__(self, get_response):
+        if not settings.TRAFFIC_RECORDING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        record = (
+            request.path.startswith('/api/')
+            and random.random() < settings.TRAFFIC_RECORDING_RATE
+        )
+        if not record:
+            return self.get_response(request)
+        started = time.time()
+        body = sanitize_body(request)
+        response = self.get_response(request)
+        user = getattr(request, 'user', None)
+        authenticated = user is not None and user.is_authenticated
+        self.write({
+            'time': round(started, 3),
+            'method': request.method,
+            'path': request.path,
+            'query': request.META.get('QUERY_STRING', ''),
+            'body': body,
+            'role': user.role if authenticated else None,
+            'user': anonymize(user.pk) if authenticated else None,
+            'status': response.status_code,
+            'duration_ms': round((time.time() - started) * 1000, 1),
+        })
+        return response
+
+    def write(self, entry):
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+        with traffic_lock:
+            with open(
+                settings.TRAFFIC_RECORDING_PATH, 'a', encoding='utf-8'
+            ) as file:
+                file.write(line)
@@ -0,0 +1,14 @@
+from django.db import models
+from django.utils import timezone
+
+
+class TimestampedQuerySet(models.QuerySet):
+    """
+    Запросы к моделям с полем `updated_at`.
+    Массовое обновление тоже меняет время изменения объектов,
+    от которого зависят валидаторы условных GET-запросов.
+    """
+
+    def update(self, **kwargs):
+        kwargs.setdefault('updated_at', timezone.now())
+        return super().update(**kwargs)
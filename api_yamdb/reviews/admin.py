@@ -5,7 +5,9 @@ from reviews.models import Category, Comments, Genre, Review, Title
 
 @admin.register(Title)
 class TitleAdmin(admin.ModelAdmin):
-    list_display = ('id', 'name', 'year', 'category', 'description')
+    list_display = (
+        'id', 'name', 'year', 'category', 'description', 'rating'
+    )
     search_fields = ('name',)
     raw_id_fields = ('category', 'genre')
     ordering = ('name',)
@@ -6,3 +6,6 @@ class ReviewsConfig(AppConfig):
     name = 'reviews'
     verbose_name = 'Ревью'
     verbose_name_plural = 'Ревью'
+
+    def ready(self):
+        from reviews import signals  # noqa: F401
@@ -0,0 +1,125 @@
+import csv
+import gzip
+import os
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from reviews.management.commands.load_data import (
+    TABLES_FILES, TABLES_ROWS, get_load_order
+)
+
+CHUNK_SIZE = 2000
+
+FORMATS = ('csv', 'jsonl')
+
+
+def to_csv_value(value):
+    """Значение поля в виде, который принимает load_data."""
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+class Command(BaseCommand):
+    help = """Экспорт данных базы данных в CSV-файлы или JSON Lines"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'output_dir',
+            help='Директория, в которую будут записаны файлы'
+        )
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            default='csv',
+            help=(
+                'csv - файлы в формате load_data; jsonl - по одному '
+                'JSON-объекту на строку'
+            )
+        )
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='Сжать файлы gzip, к имени файла добавляется .gz'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help='Количество строк, читаемых из базы данных за один запрос'
+        )
+
+    def get_path(self, model):
+        name = TABLES_FILES[model]
+        if self.format == 'jsonl':
+            name = f'{Path(name).stem}.jsonl'
+        if self.gzip:
+            name = f'{name}.gz'
+        return self.output_dir / name
+
+    def open(self, path):
+        if self.gzip:
+            return gzip.open(path, 'wt', encoding='utf-8', newline='')
+        return open(path, 'w', encoding='utf-8', newline='')
+
+    def write_csv(self, file, columns, rows):
+        writer = csv.writer(file)
+        writer.writerow(columns)
+        count = 0
+        for row in rows:
+            writer.writerow([to_csv_value(value) for value in row])
+            count += 1
+        return count
+
+    def write_jsonl(self, file, columns, rows):
+        encoder = DjangoJSONEncoder(ensure_ascii=False)
+        count = 0
+        for row in rows:
+            file.write(encoder.encode(dict(zip(columns, row))))
+            file.write('\n')
+            count += 1
+        return count
+
+    def export_table(self, model):
+        """
+        Потоковая выгрузка таблицы во временный файл с заменой целевого
+        после успешной записи.
+        """
+        columns = TABLES_ROWS[model]
+        rows = model.objects.order_by('pk').values_list(*columns).iterator(
+            chunk_size=self.chunk_size
+        )
+        path = self.get_path(model)
+        temporary_path = path.with_name(f'{path.name}.tmp')
+        started = time.monotonic()
+        write = self.write_jsonl if self.format == 'jsonl' else self.write_csv
+        try:
+            with self.open(temporary_path) as file:
+                count = write(file, columns, rows)
+        except BaseException:
+            temporary_path.unlink(missing_ok=True)
+            raise
+        os.replace(temporary_path, path)
+        elapsed = time.monotonic() - started
+        rate = count / elapsed if elapsed else count
+        self.stdout.write(self.style.SUCCESS(
+            f'Таблица {model.__qualname__} выгружена в {path.name}: '
+            f'{count} строк, {rate:.0f} строк/с'
+        ))
+
+    def handle(self, *args, **options):
+        self.output_dir = Path(options['output_dir'])
+        self.format = options['format']
+        self.gzip = options['gzip']
+        self.chunk_size = options['chunk_size']
+        if self.chunk_size < 1:
+            raise CommandError('Параметр --chunk-size должен быть больше 0')
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        for model in get_load_order(tuple(TABLES_FILES)):
+            self.export_table(model)
+        self.stdout.write(self.style.SUCCESS('Все данные успешно выгружены'))
@@ -0,0 +1,294 @@
+import csv
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+
+from api.v1.cache import bump_version
+from reviews import search
+from reviews.management.commands.load_data import (
+    TABLES_FILES, TABLES_ROWS, imported_dates
+)
+from reviews.models import (
+    Category, Comments, Genre, GenreTitle, Review, Title
+)
+
+User = get_user_model()
+
+BATCH_SIZE = 5000
+
+FIRST_DATE = datetime(2015, 1, 1, tzinfo=timezone.utc)
+
+DATES_RANGE = int(timedelta(days=365 * 10).total_seconds())
+
+FIRST_YEAR = 1950
+
+LAST_YEAR = 2023
+
+
+def zipf_rank(rng, count, exponent):
+    """
+    Номер от 1 до count с вероятностью, убывающей как rank ** -exponent.
+    Используется обратная функция непрерывного приближения распределения,
+    поэтому выбор не требует памяти под веса всех номеров.
+    """
+    if exponent == 1:
+        rank = (count + 1) ** rng.random()
+    else:
+        power = 1 - exponent
+        rank = (
+            ((count + 1) ** power - 1) * rng.random() + 1
+        ) ** (1 / power)
+    return min(int(rank), count)
+
+
+def zipf_counts(total, count, exponent, limit):
+    """
+    Распределение total объектов по count номерам по закону Ципфа.
+    Номер получает не больше limit объектов, а излишек распределяется
+    между следующими номерами пропорционально их весам.
+    """
+    remaining_weight = sum(rank ** -exponent for rank in range(1, count + 1))
+    for rank in range(1, count + 1):
+        weight = rank ** -exponent
+        share = min(limit, round(total * weight / remaining_weight))
+        total -= share
+        remaining_weight -= weight
+        yield share
+
+
+class Command(BaseCommand):
+    help = """Генерация большого синтетического набора данных"""
+
+    def add_arguments(self, parser):
+        for name, default, help_text in (
+            ('users', 1000, 'Количество пользователей'),
+            ('categories', 10, 'Количество категорий'),
+            ('genres', 20, 'Количество жанров'),
+            ('titles', 1000, 'Количество произведений'),
+            ('reviews', 10000, 'Количество отзывов (приблизительно)'),
+            ('comments', 20000, 'Количество комментариев'),
+            ('max-genres', 3, 'Наибольшее количество жанров произведения'),
+            ('seed', 0, 'Начальное значение генератора случайных чисел'),
+            ('batch-size', BATCH_SIZE, 'Количество строк в одной пачке'),
+        ):
+            parser.add_argument(
+                f'--{name}', type=int, default=default, help=help_text
+            )
+        parser.add_argument(
+            '--zipf',
+            type=float,
+            default=1.1,
+            help=(
+                'Показатель распределения Ципфа для популярности '
+                'произведений и отзывов; 0 - равномерное распределение'
+            )
+        )
+        parser.add_argument(
+            '--output',
+            help=(
+                'Директория для CSV-файлов в формате load_data; без него '
+                'данные записываются прямо в базу данных'
+            )
+        )
+
+    def random_date(self):
+        return FIRST_DATE + timedelta(
+            seconds=self.rng.randrange(DATES_RANGE)
+        )
+
+    def get_offsets(self):
+        """Первые свободные id таблиц, чтобы дополнить существующие данные."""
+        if self.output:
+            return dict.fromkeys(TABLES_FILES, 0)
+        return {
+            model: model.objects.aggregate(last=Max('id'))['last'] or 0
+            for model in TABLES_FILES
+        }
+
+    def generate_users(self):
+        first = self.offsets[User] + 1
+        for user_id in range(first, first + self.options['users']):
+            yield {
+                'id': user_id,
+                'username': f'user{user_id}',
+                'email': f'user{user_id}@yamdb.fake',
+                'role': User.USER,
+                'bio': '',
+                'first_name': '',
+                'last_name': '',
+                'password': '',
+                'is_staff': False,
+                'is_superuser': False,
+                'is_active': True,
+                'date_joined': self.random_date(),
+                'last_login': None,
+            }
+
+    def generate_groups(self, model, name, count):
+        first = self.offsets[model] + 1
+        for group_id in range(first, first + count):
+            yield {
+                'id': group_id,
+                'name': f'{name} {group_id}',
+                'slug': f'{model._meta.model_name}-{group_id}',
+            }
+
+    def generate_titles(self):
+        first = self.offsets[Title] + 1
+        for title_id in range(first, first + self.options['titles']):
+            yield {
+                'id': title_id,
+                'name': f'Произведение {title_id}',
+                'year': self.rng.randint(FIRST_YEAR, LAST_YEAR),
+                'category_id': self.offsets[Category] + self.rng.randint(
+                    1, self.options['categories']
+                ),
+                'description': f'Описание произведения {title_id}',
+            }
+
+    def generate_genre_titles(self):
+        link_id = self.offsets[GenreTitle]
+        genres = range(
+            self.offsets[Genre] + 1,
+            self.offsets[Genre] + self.options['genres'] + 1
+        )
+        first = self.offsets[Title] + 1
+        for title_id in range(first, first + self.options['titles']):
+            count = self.rng.randint(
+                1, min(self.options['max_genres'], len(genres))
+            )
+            for genre_id in sorted(self.rng.sample(genres, count)):
+                link_id += 1
+                yield {'id': link_id, 'title_id': title_id,
+                       'genre_id': genre_id}
+
+    def generate_reviews(self):
+        """
+        Отзывы по произведениям в порядке убывания их популярности.
+        Авторы отзывов на одно произведение не повторяются.
+        """
+        review_id = self.offsets[Review]
+        users = range(
+            self.offsets[User] + 1,
+            self.offsets[User] + self.options['users'] + 1
+        )
+        counts = zipf_counts(
+            self.options['reviews'], self.options['titles'],
+            self.options['zipf'], len(users)
+        )
+        for rank, count in enumerate(counts, 1):
+            title_id = self.offsets[Title] + rank
+            for author_id in self.rng.sample(users, count):
+                review_id += 1
+                yield {
+                    'id': review_id,
+                    'title_id': title_id,
+                    'text': f'Отзыв {review_id}',
+                    'author_id': author_id,
+                    'score': self.rng.randint(1, 10),
+                    'pub_date': self.random_date(),
+                }
+        self.reviews_count = review_id - self.offsets[Review]
+
+    def generate_comments(self):
+        if not self.reviews_count:
+            return
+        first = self.offsets[Comments] + 1
+        for comment_id in range(first, first + self.options['comments']):
+            yield {
+                'id': comment_id,
+                'review_id': self.offsets[Review] + zipf_rank(
+                    self.rng, self.reviews_count, self.options['zipf']
+                ),
+                'text': f'Комментарий {comment_id}',
+                'author_id': self.offsets[User] + self.rng.randint(
+                    1, self.options['users']
+                ),
+                'pub_date': self.random_date(),
+            }
+
+    def generate(self):
+        """Таблицы и строки в порядке зависимостей по внешним ключам."""
+        yield User, self.generate_users()
+        yield Category, self.generate_groups(
+            Category, 'Категория', self.options['categories']
+        )
+        yield Genre, self.generate_groups(
+            Genre, 'Жанр', self.options['genres']
+        )
+        yield Title, self.generate_titles()
+        yield GenreTitle, self.generate_genre_titles()
+        yield Review, self.generate_reviews()
+        yield Comments, self.generate_comments()
+
+    def write_csv(self, model, rows):
+        path = Path(self.output) / TABLES_FILES[model]
+        with open(path, 'w', encoding='utf-8', newline='') as file:
+            writer = csv.DictWriter(file, TABLES_ROWS[model])
+            writer.writeheader()
+            count = 0
+            for row in rows:
+                writer.writerow({
+                    column: value.isoformat()
+                    if isinstance(value, datetime) else value
+                    for column, value in row.items()
+                })
+                count += 1
+        return count
+
+    def insert(self, model, rows):
+        count = 0
+        with imported_dates(model, TABLES_ROWS[model]):
+            while True:
+                batch = [
+                    model(**row) for row in islice(rows, self.batch_size)
+                ]
+                if not batch:
+                    return count
+                with transaction.atomic():
+                    model.objects.bulk_create(batch)
+                count += len(batch)
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.output = options['output']
+        self.batch_size = options['batch_size']
+        if options['zipf'] < 0:
+            raise CommandError('Параметр --zipf не может быть меньше 0')
+        if options['titles'] and not options['categories']:
+            raise CommandError('Для произведений нужна хотя бы одна категория')
+        if options['titles'] and not options['genres']:
+            raise CommandError('Для произведений нужен хотя бы один жанр')
+        if options['comments'] and not options['users']:
+            raise CommandError('Для комментариев нужны пользователи')
+        if self.output:
+            Path(self.output).mkdir(parents=True, exist_ok=True)
+        self.rng = random.Random(options['seed'])
+        self.offsets = self.get_offsets()
+        self.reviews_count = 0
+        write = self.write_csv if self.output else self.insert
+        written = set()
+        for model, rows in self.generate():
+            started = time.monotonic()
+            count = write(model, rows)
+            if count:
+                written.add(model)
+            elapsed = time.monotonic() - started
+            rate = count / elapsed if elapsed else count
+            self.stdout.write(self.style.SUCCESS(
+                f'{model.__qualname__}: {count} строк, {rate:.0f} строк/с'
+            ))
+        if not self.output:
+            Title.objects.refresh_rating()
+            search.rebuild_index()
+            # Массовая запись не вызывает сигналов, сбрасывающих кэш API.
+            for model in (written | {Title}) - {GenreTitle}:
+                bump_version(model)
+        self.stdout.write(self.style.SUCCESS('Набор данных сгенерирован'))
@@ -1,17 +1,38 @@
 import csv
+import gzip
+import json
+import os
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from graphlib import TopologicalSorter
+from itertools import islice
+from pathlib import Path
 
+import django
+from django.apps import apps
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
 from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
 from django.db.utils import IntegrityError
+from django.utils import timezone
 
+from api.v1.cache import bump_version
+from reviews import search
 from reviews.models import (
     Category, Comments, Genre, GenreTitle, Review, Title
 )
 
 User = get_user_model()
 
-DATA_DIR = f'{settings.BASE_DIR}\\static\\data\\'
+DATA_DIR = settings.BASE_DIR / 'static' / 'data'
+
+BATCH_SIZE = 1000
+
+PROGRESS_INTERVAL = 5
 
 TABLES_FILES = {
     User: 'users.csv',
@@ -25,81 +46,478 @@ TABLES_FILES = {
 
 TABLES_ROWS = {
     User: [
-        'id', 'username', 'emeil', 'role', 'bio', 'first_name', 'last_name'
+        'id', 'username', 'email', 'role', 'bio', 'first_name', 'last_name',
+        'password', 'is_staff', 'is_superuser', 'is_active', 'date_joined',
+        'last_login'
     ],
     Category: ['id', 'name', 'slug'],
     Genre: ['id', 'name', 'slug'],
-    Title: ['id', 'name', 'year', 'category_id'],
+    Title: ['id', 'name', 'year', 'category_id', 'description'],
     Review: ['id', 'title_id', 'text', 'author_id', 'score', 'pub_date'],
     Comments: ['id', 'review_id', 'text', 'author_id', 'pub_date'],
     GenreTitle: ['id', 'title_id', 'genre_id'],
 }
 
+# Пустое значение сохраняется как есть: у пользователей,
+# зарегистрированных через API, пароля нет.
+EMPTY_VALUE_FIELDS = ('password',)
+
+CHECKPOINT_FILE = '.load_data_checkpoint.json'
+
 FLUSHING_MESSAGE = (
     '\nПеред следующей загрузкой данных необходимо очистить базу '
-    'данных командой "python manage.py flush"'
+    'данных командой "python manage.py flush" или повторить загрузку '
+    'с параметром "--mode upsert"'
 )
 
 
+def get_load_order(models):
+    """Топологическая сортировка моделей по внешним ключам между ними."""
+    graph = {
+        model: {
+            field.related_model for field in model._meta.concrete_fields
+            if field.is_relation
+            and field.related_model in models
+            and field.related_model is not model
+        }
+        for model in models
+    }
+    return tuple(TopologicalSorter(graph).static_order())
+
+
+@contextmanager
+def imported_dates(model, columns):
+    """
+    Сохранение дат из файла вместо текущего времени для полей
+    с auto_now_add на время загрузки.
+    """
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False) and field.attname in columns
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def open_data_file(path):
+    """Открытие CSV-файла или его сжатой копии с расширением .gz."""
+    if not path.exists() and path.with_name(f'{path.name}.gz').exists():
+        return gzip.open(
+            path.with_name(f'{path.name}.gz'), 'rt', encoding='utf-8',
+            newline=''
+        )
+    return open(path, 'r', encoding='utf-8', newline='')
+
+
+def init_worker():
+    """Инициализация Django в процессе-обработчике, запущенном через spawn."""
+    if not apps.ready:
+        django.setup()
+
+
+def parse_rows(model_label, first_line, rows):
+    """
+    Преобразование строк CSV в значения полей модели с их проверкой.
+    Выполняется в пуле процессов и не обращается к базе данных.
+    """
+    model = apps.get_model(model_label)
+    parsed = []
+    for line, row in enumerate(rows, first_line):
+        data = {}
+        for column, value in row.items():
+            field = model._meta.get_field(column)
+            try:
+                if value == '' and column in EMPTY_VALUE_FIELDS:
+                    value = ''
+                elif value == '' and field.null:
+                    value = None
+                elif field.is_relation:
+                    value = field.to_python(value)
+                else:
+                    value = field.clean(value, None)
+            except ValidationError as e:
+                raise ValueError(
+                    f'строка {line}, поле {column}: {"; ".join(e.messages)}'
+                )
+            data[field.attname] = value
+        parsed.append(data)
+    return parsed
+
+
 class Command(BaseCommand):
     help = """Импорт данных из CSV-файлов для базы данных"""
 
-    def load_data(self, model, file_name):
-        with open(
-                f'{DATA_DIR}{file_name}',
-                'r',
-                encoding='utf-8'
-        ) as file:
-            reader = csv.DictReader(file)
-            try:
-                model.objects.bulk_create(
-                    model(**data) for data in reader)
-            except ValueError as e:
-                column_names = reader.fieldnames
-                for row in column_names:
-                    if row not in TABLES_ROWS[model]:
-                        raise CommandError(
-                            f'{e}\n'
-                            f'Поля {row} нет в таблице. '
-                            f'Проверьте названия полей в файле {file_name}. '
-                            f'Допустимые поля: {TABLES_ROWS[model]}'
-                            f'{FLUSHING_MESSAGE}'
-                        )
-            else:
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f'Данные в таблицу {model.__qualname__} загружены'
-                    )
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--data-dir',
+            default=DATA_DIR,
+            help='Директория с CSV-файлами'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Количество строк, записываемых в одной транзакции'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count(),
+            help=(
+                'Количество процессов для разбора CSV-файлов; при 0 разбор '
+                'идёт в одном фоновом потоке'
+            )
+        )
+        parser.add_argument(
+            '--mode',
+            choices=('insert', 'upsert'),
+            default='insert',
+            help=(
+                'insert - только добавление строк; upsert - добавление новых '
+                'и обновление изменившихся строк по первичному ключу'
+            )
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help=(
+                'Пропустить строки, сохранённые предыдущей прерванной '
+                'загрузкой, по файлу контрольной точки'
+            )
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help=(
+                'Файл контрольной точки, по умолчанию '
+                f'{CHECKPOINT_FILE} в директории с данными'
+            )
+        )
+        parser.add_argument(
+            '--atomic',
+            action='store_true',
+            help=(
+                'Загрузить все таблицы в одной транзакции: при ошибке база '
+                'данных останется без изменений'
+            )
+        )
+
+    def check_columns(self, model, file_name, column_names):
+        """Проверка заголовка CSV-файла до начала загрузки."""
+        for column in column_names or ():
+            if column not in TABLES_ROWS[model]:
+                raise CommandError(
+                    f'Поля {column} нет в таблице. '
+                    f'Проверьте названия полей в файле {file_name}. '
+                    f'Допустимые поля: {TABLES_ROWS[model]}'
+                    f'{FLUSHING_MESSAGE}'
+                )
+        if self.mode == 'upsert' and 'id' not in (column_names or ()):
+            raise CommandError(
+                f'Для режима upsert в файле {file_name} нужно поле id'
+            )
+
+    def read_batches(self, reader, batch_size):
+        """Построчное чтение файла пачками фиксированного размера."""
+        while True:
+            batch = list(islice(reader, batch_size))
+            if not batch:
+                return
+            yield batch
+
+    def load_checkpoint(self):
+        if not self.resume or not self.checkpoint_path.exists():
+            return {}
+        with open(self.checkpoint_path, encoding='utf-8') as file:
+            return json.load(file)
+
+    def save_checkpoint(self, model, rows):
+        """Атомарная запись числа сохранённых строк таблицы."""
+        if self.atomic:
+            return
+        self.checkpoint[model._meta.label] = rows
+        temporary_path = self.checkpoint_path.with_suffix('.tmp')
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump(self.checkpoint, file)
+        os.replace(temporary_path, self.checkpoint_path)
+
+    def report_progress(self, model, final=False):
+        """Вывод скорости загрузки не чаще раза в PROGRESS_INTERVAL секунд."""
+        now = time.monotonic()
+        if not final and now - self.reported < PROGRESS_INTERVAL:
+            return
+        self.reported = now
+        stats = self.stats[model]
+        elapsed = now - self.started
+        rate = stats['rows'] / elapsed if elapsed else stats['rows']
+        progress = (
+            f'{stats["rows"]} строк (добавлено {stats["inserted"]}, '
+            f'обновлено {stats["updated"]}, пропущено {stats["skipped"]}), '
+            f'{rate:.0f} строк/с'
+        )
+        if final:
+            self.stdout.write(self.style.SUCCESS(
+                f'Данные в таблицу {model.__qualname__} загружены: {progress}'
+            ))
+        else:
+            self.stdout.write(f'{model.__qualname__}: {progress}')
+
+    def read_all(self):
+        """Чтение пачек строк всех файлов в порядке зависимостей таблиц."""
+        for model in get_load_order(tuple(TABLES_FILES)):
+            file_name = TABLES_FILES[model]
+            self.reading = (model, file_name)
+            with open_data_file(self.data_dir / file_name) as file:
+                reader = csv.DictReader(file)
+                self.check_columns(model, file_name, reader.fieldnames)
+                skipped = sum(1 for _ in islice(
+                    reader, self.checkpoint.get(model._meta.label, 0)
+                ))
+                self.stats[model]['skipped'] += skipped
+                self.stats[model]['rows'] += skipped
+                line = 2 + skipped
+                for batch in self.read_batches(reader, self.batch_size):
+                    yield model, line, batch
+                    line += len(batch)
+                if line == 2 + skipped:
+                    yield model, line, []
+
+    def track_changes(self, model, data, current=None):
+        """
+        Учёт произведений, затронутых записанной строкой: у них после
+        загрузки пересчитывается рейтинг, время изменения или поисковый
+        индекс. Строка без id учитывается как изменение всех произведений.
+        """
+        if model is Review:
+            previous = current or {}
+            if (
+                previous.get('score') != data.get('score')
+                or previous.get('title_id') != data.get('title_id')
+            ):
+                self.titles['rated'].update(
+                    {data.get('title_id'), previous.get('title_id')} - {None}
                 )
+        elif model is GenreTitle:
+            self.titles['touched'].update(
+                {data.get('title_id'), (current or {}).get('title_id')}
+                - {None}
+            )
+        elif model is Title:
+            self.titles['indexed'].add(data.get('id'))
+        elif model in (Genre, Category) and current is not None:
+            self.groups[model].add(data['id'])
+
+    def insert_rows(self, model, rows):
+        model.objects.bulk_create(
+            (model(**data) for data in rows),
+            batch_size=self.batch_size
+        )
+        for data in rows:
+            self.track_changes(model, data)
+        return Counter(inserted=len(rows))
+
+    def upsert_rows(self, model, rows):
+        """
+        Добавление новых строк и обновление только изменившихся.
+        Поля с auto_now получают текущее время у обновлённых строк.
+        """
+        columns = list(rows[0]) if rows else []
+        existing = {
+            values['id']: values for values in model.objects.filter(
+                pk__in=[data['id'] for data in rows]
+            ).values(*columns)
+        }
+        auto_now = {
+            field.attname: timezone.now()
+            for field in model._meta.concrete_fields
+            if getattr(field, 'auto_now', False)
+        }
+        new, changed = [], []
+        for data in rows:
+            current = existing.get(data['id'])
+            if current is None:
+                new.append(model(**data))
+            elif current != data:
+                changed.append(model(**{**data, **auto_now}))
+            else:
+                continue
+            self.track_changes(model, data, current)
+        model.objects.bulk_create(new, batch_size=self.batch_size)
+        update_fields = [
+            column for column in {**dict.fromkeys(columns), **auto_now}
+            if column != 'id'
+        ]
+        if changed and update_fields:
+            model.objects.bulk_update(
+                changed, update_fields, batch_size=self.batch_size
+            )
+        return Counter(
+            inserted=len(new),
+            updated=len(changed),
+            skipped=len(rows) - len(new) - len(changed)
+        )
+
+    def write_batch(self, model, line, parsed):
+        """Запись разобранной пачки единственным процессом-писателем."""
+        if model is not self.model:
+            self.finish_table()
+            self.model, self.file_name = model, TABLES_FILES[model]
+            self.started = self.reported = time.monotonic()
+        rows = parsed.result()
+        columns = rows[0].keys() if rows else ()
+        write = self.upsert_rows if self.mode == 'upsert' else self.insert_rows
+        with transaction.atomic(), imported_dates(model, columns):
+            counts = write(model, rows)
+        self.stats[model].update(counts)
+        self.stats[model]['rows'] += len(rows)
+        self.save_checkpoint(model, line - 2 + len(rows))
+        self.report_progress(model)
+
+    def finish_table(self):
+        if self.model is not None:
+            self.report_progress(self.model, final=True)
+
+    def load_all(self, executor):
+        """
+        Разбор пачек в пуле процессов с опережением и их запись
+        в порядке зависимостей таблиц.
+        """
+        pending = deque()
+        window = 2 * max(self.workers, 1)
+        for model, line, batch in self.read_all():
+            pending.append((model, line, executor.submit(
+                parse_rows, model._meta.label, line, batch
+            )))
+            if len(pending) >= window:
+                self.write_batch(*pending.popleft())
+        while pending:
+            self.write_batch(*pending.popleft())
+        self.finish_table()
+        self.update_titles()
+
+    def get_chunks(self, ids):
+        ids = sorted(ids)
+        for start in range(0, len(ids), self.batch_size):
+            yield ids[start:start + self.batch_size]
+
+    def update_titles(self):
+        """
+        Пересчёт рейтинга, времени изменения и поискового индекса
+        только у затронутых загрузкой произведений. После прерванной
+        загрузки затронутые ею произведения неизвестны, поэтому при
+        --resume всё пересчитывается полностью.
+        """
+        if self.resumed:
+            Title.objects.refresh_rating()
+            search.rebuild_index()
+            return
+        for chunk in self.get_chunks(self.titles['rated']):
+            Title.objects.filter(pk__in=chunk).refresh_rating()
+        touched = self.titles['touched'] - self.titles['rated']
+        for chunk in self.get_chunks(touched):
+            Title.objects.filter(pk__in=chunk).update()
+        for chunk in self.get_chunks(self.groups[Genre]):
+            Title.objects.filter(genre__in=chunk).update()
+        for chunk in self.get_chunks(self.groups[Category]):
+            Title.objects.filter(category__in=chunk).update()
+        indexed = self.titles['indexed']
+        if None in indexed:
+            search.rebuild_index()
+        else:
+            for chunk in self.get_chunks(indexed):
+                search.index_titles(chunk)
+
+    def invalidate_cache(self):
+        """
+        Сброс закэшированных ответов API по изменённым таблицам:
+        массовая запись не вызывает сигналов моделей. Ответы
+        с произведениями сбрасываются и при изменении их рейтинга,
+        жанров и категорий.
+        """
+        changed = {
+            model for model, stats in self.stats.items()
+            if stats['inserted'] or stats['updated']
+        }
+        if any(self.titles.values()) or any(self.groups.values()):
+            changed.add(Title)
+        for model in changed - {GenreTitle}:
+            transaction.on_commit(lambda model=model: bump_version(model))
+
+    def get_error_message(self):
+        message = (
+            f'При загрузке данных в таблицу {self.model.__qualname__} '
+            'произошла ошибка'
+        )
+        rows = self.stats[self.model]['rows']
+        if rows and not self.atomic:
+            message += f' (строк этой таблицы уже сохранено: {rows})'
+        return f'{message}: '
 
     def handle(self, *args, **options):
+        self.data_dir = Path(options['data_dir'])
+        self.batch_size = options['batch_size']
+        self.atomic = options['atomic']
+        self.workers = options['workers']
+        self.mode = options['mode']
+        self.resume = options['resume']
+        self.checkpoint_path = Path(
+            options['checkpoint'] or self.data_dir / CHECKPOINT_FILE
+        )
+        if self.resume and self.atomic:
+            raise CommandError(
+                'Параметры --resume и --atomic несовместимы: при атомарной '
+                'загрузке контрольные точки не сохраняются'
+            )
+        self.checkpoint = self.load_checkpoint()
+        self.resumed = bool(self.checkpoint)
+        self.model = self.file_name = self.reading = None
+        self.stats = {model: Counter() for model in TABLES_FILES}
+        self.titles = defaultdict(set)
+        self.groups = defaultdict(set)
+        if self.workers > 0:
+            connections.close_all()
+            executor = ProcessPoolExecutor(
+                self.workers, initializer=init_worker
+            )
+        else:
+            executor = ThreadPoolExecutor(1)
         try:
-            for model, file_name in TABLES_FILES.items():
-                error_message = (
-                    f'При загрузке данных в таблицу {model.__qualname__} '
-                    'произошла ошибка: '
-                )
-                self.load_data(model, file_name)
+            with executor:
+                if self.atomic:
+                    with transaction.atomic():
+                        self.load_all(executor)
+                else:
+                    self.load_all(executor)
         except FileNotFoundError as e:
+            self.model, self.file_name = self.reading
             raise CommandError(
-                f'{error_message}{e}\n'
-                f'Проверьте, что в директории "{DATA_DIR}" находится файл '
-                f'"{file_name}" и он правильно назван'
+                f'{self.get_error_message()}{e}\n'
+                f'Проверьте, что в директории "{self.data_dir}" находится '
+                f'файл "{self.file_name}" и он правильно назван'
                 f'{FLUSHING_MESSAGE}'
             )
         except IntegrityError as e:
             raise CommandError(
-                f'{error_message}{e}\n'
+                f'{self.get_error_message()}{e}\n'
                 'Данные, которые вы пытаетесь загрузить, уже есть в таблице'
                 f'{FLUSHING_MESSAGE}'
             )
+        except CommandError:
+            raise
         except Exception as e:
             raise CommandError(
-                f'{error_message}{e}{FLUSHING_MESSAGE}'
+                f'{self.get_error_message()}{e}{FLUSHING_MESSAGE}'
             )
         else:
+            self.checkpoint_path.unlink(missing_ok=True)
             self.stdout.write(
                 self.style.SUCCESS(
                     'Все данные успешно загружены'
                 )
             )
+        finally:
+            self.invalidate_cache()
@@ -1,12 +1,18 @@
 from django.contrib.auth import get_user_model
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, Count, F, OuterRef, Subquery, Sum, When
+from django.db.models.functions import Cast, Coalesce
 from django.utils import timezone
 
 from core import constants as const
+from core.models import TimestampedQuerySet
+from reviews import search
 
 User = get_user_model()
 
+RATING_FIELDS = ('rating_sum', 'review_count', 'rating')
+
 
 class AbstractModelGenreCategory(models.Model):
     """Абстрактная модель для жанров и категорий."""
@@ -20,6 +26,13 @@ class AbstractModelGenreCategory(models.Model):
         max_length=const.MAX_LENGHT_SLUG_FIELD,
         unique=True,
     )
+    updated_at = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True,
+        db_index=True,
+    )
+
+    objects = TimestampedQuerySet.as_manager()
 
     class Meta:
         abstract = True
@@ -41,6 +54,12 @@ class CommentReviewAbstractModel(models.Model):
         'Дата публикации',
         auto_now_add=True,
     )
+    updated_at = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True,
+    )
+
+    objects = TimestampedQuerySet.as_manager()
 
     class Meta:
         abstract = True
@@ -54,6 +73,9 @@ class Genre(AbstractModelGenreCategory):
         verbose_name_plural = 'Жанры'
         default_related_name = 'genres'
         ordering = ('name',)
+        indexes = [
+            models.Index(fields=['name'], name='genre_name_idx'),
+        ]
 
 
 class Category(AbstractModelGenreCategory):
@@ -64,6 +86,59 @@ class Category(AbstractModelGenreCategory):
         verbose_name_plural = 'Категории'
         default_related_name = 'categories'
         ordering = ('name',)
+        indexes = [
+            models.Index(fields=['name'], name='category_name_idx'),
+        ]
+
+
+class TitleQuerySet(TimestampedQuerySet):
+    """Запросы для произведений."""
+
+    def change_rating(self, score_delta, count_delta):
+        """Инкрементальное изменение суммы оценок и количества отзывов."""
+        rating_sum = F('rating_sum') + score_delta
+        review_count = F('review_count') + count_delta
+        return self.update(
+            rating_sum=rating_sum,
+            review_count=review_count,
+            rating=Case(
+                When(review_count__lte=-count_delta, then=None),
+                default=(
+                    Cast(rating_sum, models.FloatField()) / review_count
+                ),
+                output_field=models.FloatField(),
+            ),
+        )
+
+    def search(self, query):
+        """Полнотекстовый поиск по названию и описанию произведений."""
+        return search.search(self, query)
+
+    def refresh_rating(self):
+        """Пересчёт рейтинга по всем отзывам на произведения."""
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+        self.update(
+            rating_sum=Coalesce(
+                Subquery(reviews.annotate(total=Sum('score')).values('total')),
+                0
+            ),
+            review_count=Coalesce(
+                Subquery(reviews.annotate(total=Count('pk')).values('total')),
+                0
+            ),
+        )
+        return self.update(
+            rating=Case(
+                When(review_count=0, then=None),
+                default=(
+                    Cast('rating_sum', models.FloatField())
+                    / F('review_count')
+                ),
+                output_field=models.FloatField(),
+            )
+        )
 
 
 class Title(models.Model):
@@ -103,20 +178,72 @@ class Title(models.Model):
         null=True,
         blank=True
     )
+    rating_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0,
+        editable=False,
+    )
+    review_count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов',
+        default=0,
+        editable=False,
+    )
+    rating = models.FloatField(
+        verbose_name='Рейтинг',
+        null=True,
+        editable=False,
+    )
+    updated_at = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True,
+        db_index=True,
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         ordering = ('name',)
+        indexes = [
+            models.Index(fields=['name', 'id'], name='title_name_idx'),
+            models.Index(
+                fields=['category', 'year'], name='title_category_year_idx'
+            ),
+        ]
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
 
     def __str__(self):
         return self.name[:const.MAX_STR_LENGTH]
 
+    def save(self, *args, **kwargs):
+        """
+        Сохранение существующего произведения без счётчиков рейтинга:
+        их меняют только запросы отзывов, и объект, загруженный
+        до нового отзыва, не должен возвращать прежние значения.
+        """
+        if (
+            not self._state.adding and not args
+            and kwargs.get('update_fields') is None
+            and not kwargs.get('force_insert')
+        ):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in RATING_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
 
 class GenreTitle(models.Model):
     genre = models.ForeignKey(Genre, on_delete=models.CASCADE)
     title = models.ForeignKey(Title, on_delete=models.CASCADE)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['genre', 'title'], name='unique_genre_title'
+            )
+        ]
+
     def __str__(self):
         return f'{self.title}: {self.genre}'[:const.MAX_STR_LENGTH]
 
@@ -151,10 +278,48 @@ class Review(CommentReviewAbstractModel):
         constraints = [
             models.UniqueConstraint(
                 fields=['author', 'title'], name='unique_review')]
+        indexes = [
+            models.Index(
+                fields=['title', 'pub_date', 'id'],
+                name='review_title_pub_date_idx'
+            ),
+            models.Index(
+                fields=['title', 'updated_at'],
+                name='review_title_updated_at_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.text[:const.MAX_STR_LENGTH]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_score()
+        return instance
+
+    def _remember_score(self):
+        """Запоминание оценки, учтённой в рейтинге произведения."""
+        self._rated = (
+            self.__dict__.get('title_id'), self.__dict__.get('score')
+        )
+
+    def save(self, *args, **kwargs):
+        """Сохранение отзыва с обновлением рейтинга произведения."""
+        old_title_id, old_score = getattr(self, '_rated', (None, None))
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            titles = Title.objects.filter(pk=self.title_id)
+            if old_title_id is None:
+                titles.change_rating(self.score, 1)
+            elif old_title_id != self.title_id or old_score is None:
+                Title.objects.filter(
+                    pk__in=(old_title_id, self.title_id)
+                ).refresh_rating()
+            elif old_score != self.score:
+                titles.change_rating(self.score - old_score, 0)
+        self._remember_score()
+
 
 class Comments(CommentReviewAbstractModel):
     """Модель для комментариев."""
@@ -170,6 +335,16 @@ class Comments(CommentReviewAbstractModel):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ['-pub_date']
+        indexes = [
+            models.Index(
+                fields=['review', 'pub_date', 'id'],
+                name='comment_review_pub_date_idx'
+            ),
+            models.Index(
+                fields=['review', 'updated_at'],
+                name='comment_review_updated_at_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.text[:const.MAX_STR_LENGTH]
@@ -0,0 +1,100 @@
+from django.db import connection
+from django.db.models import Q
+
+FTS_TABLE = 'reviews_title_fts'
+
+NAME_WEIGHT = 10.0
+
+DESCRIPTION_WEIGHT = 1.0
+
+
+def is_enabled():
+    """Полнотекстовый индекс FTS5 ведётся только на SQLite."""
+    return connection.vendor == 'sqlite'
+
+
+def match_expression(query):
+    """
+    Преобразование поисковой строки в выражение MATCH.
+    Каждое слово ищется по префиксу, все слова должны присутствовать.
+    """
+    return ' '.join(
+        '"{}"*'.format(word.replace('"', '""')) for word in query.split()
+    )
+
+
+def index_title(title):
+    """Добавление или обновление произведения в индексе."""
+    if not is_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT OR REPLACE INTO {FTS_TABLE} (rowid, name, description) '
+            'VALUES (%s, %s, %s)',
+            (title.pk, title.name, title.description)
+        )
+
+
+def unindex_title(title_id):
+    """Удаление произведения из индекса."""
+    if not is_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', (title_id,)
+        )
+
+
+def index_titles(title_ids):
+    """Добавление или обновление произведений в индексе по их id."""
+    if not is_enabled():
+        return
+    placeholders = ', '.join(['%s'] * len(title_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})',
+            title_ids
+        )
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, name, description) '
+            'SELECT id, name, description FROM reviews_title '
+            f'WHERE id IN ({placeholders})',
+            title_ids
+        )
+
+
+def rebuild_index():
+    """Полное перестроение индекса, например после массовой загрузки."""
+    if not is_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, name, description) '
+            'SELECT id, name, description FROM reviews_title'
+        )
+
+
+def search(queryset, query):
+    """Отбор произведений по поисковой строке по убыванию релевантности."""
+    match = match_expression(query)
+    if not match:
+        return queryset.none()
+    if not is_enabled():
+        return queryset.filter(
+            Q(name__icontains=query) | Q(description__icontains=query)
+        )
+    title_table = queryset.model._meta.db_table
+    return queryset.extra(
+        tables=[FTS_TABLE],
+        where=[
+            f'{FTS_TABLE}.rowid = {title_table}.id',
+            f'{FTS_TABLE} MATCH %s',
+        ],
+        params=[match],
+        select={
+            'search_rank': (
+                f'bm25({FTS_TABLE}, {NAME_WEIGHT}, {DESCRIPTION_WEIGHT})'
+            ),
+        },
+    ).order_by('search_rank', 'name')
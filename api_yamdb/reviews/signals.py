@@ -0,0 +1,34 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from reviews import search
+from reviews.models import Review, Title
+
+
+@receiver(post_delete, sender=Review)
+def remove_review_from_rating(sender, instance, **kwargs):
+    """Исключение оценки удалённого отзыва из рейтинга произведения.
+
+    Срабатывает и при каскадном удалении отзывов вместе с автором
+    или произведением.
+    """
+    title_id, score = getattr(
+        instance, '_rated', (instance.title_id, instance.score)
+    )
+    titles = Title.objects.filter(pk=title_id)
+    if score is None:
+        titles.refresh_rating()
+    else:
+        titles.change_rating(-score, -1)
+
+
+@receiver(post_save, sender=Title)
+def index_title(sender, instance, **kwargs):
+    """Обновление произведения в поисковом индексе."""
+    search.index_title(instance)
+
+
+@receiver(post_delete, sender=Title)
+def unindex_title(sender, instance, **kwargs):
+    """Удаление произведения из поискового индекса."""
+    search.unindex_title(instance.pk)
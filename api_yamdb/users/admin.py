@@ -2,6 +2,8 @@ from django.contrib import admin
 from django.contrib.auth import get_user_model
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 
+from users.models import OutgoingEmail
+
 User = get_user_model()
 
 
@@ -16,6 +18,21 @@ class UserAdmin(BaseUserAdmin):
     )
 
 
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'recipient',
+        'subject',
+        'created_at',
+        'sent_at',
+        'attempts',
+    )
+    list_filter = ('sent_at',)
+    search_fields = ('recipient',)
+    # В тексте неотправленного письма хранится код подтверждения.
+    exclude = ('message',)
+
+
 admin.site.site_title = 'Административный сайт YaMDb'
 admin.site.site_header = 'Администрирование YaMDb'
 admin.site.empty_value_display = 'Не задано'
@@ -0,0 +1,125 @@
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from users.models import OutgoingEmail
+
+BATCH_SIZE = 100
+
+POLL_INTERVAL = 5
+
+
+class Command(BaseCommand):
+    help = """Отправка писем из очереди исходящих писем"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Количество писем, отправляемых через одно соединение'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Не завершаться, а проверять очередь каждые --interval секунд'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=POLL_INTERVAL,
+            help='Пауза между проверками очереди в режиме --loop, секунды'
+        )
+
+    def postpone(self, email, error):
+        """Откладывание письма с экспоненциально растущей паузой."""
+        email.last_error = str(error)
+        email.send_after = timezone.now() + timedelta(
+            seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** email.attempts
+        )
+        email.attempts += 1
+
+    def send_all(self, connection, emails):
+        for email in emails:
+            try:
+                EmailMessage(
+                    subject=email.subject,
+                    body=email.message,
+                    from_email=email.from_email,
+                    to=(email.recipient,),
+                    connection=connection,
+                ).send()
+            except Exception as e:
+                self.postpone(email, e)
+            else:
+                email.sent_at = timezone.now()
+                email.attempts += 1
+                email.message = ''
+
+    def claim_batch(self):
+        """
+        Захват пачки писем обработчиком: условное обновление занимает
+        только письма, ещё не занятые другим обработчиком, поэтому
+        параллельно запущенные команды не отправляют письма повторно.
+        """
+        pending = OutgoingEmail.objects.pending(
+            settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+            settings.EMAIL_OUTBOX_CLAIM_TIMEOUT
+        )
+        ids = list(pending.values_list('id', flat=True)[:self.batch_size])
+        if not ids:
+            return []
+        token = uuid.uuid4().hex
+        pending.filter(pk__in=ids).update(
+            claimed_by=token, claimed_at=timezone.now()
+        )
+        return list(OutgoingEmail.objects.filter(claimed_by=token))
+
+    def send_batch(self):
+        """
+        Отправка пачки писем через одно соединение с почтовым сервером.
+        Письмо, которое не удалось отправить, откладывается до следующей
+        попытки, пока их число не достигнет EMAIL_OUTBOX_MAX_ATTEMPTS.
+        Текст отправленного письма с кодом подтверждения стирается.
+        """
+        emails = self.claim_batch()
+        if not emails:
+            return 0, 0
+        connection = get_connection()
+        try:
+            connection.open()
+        except Exception as e:
+            for email in emails:
+                self.postpone(email, e)
+        else:
+            try:
+                self.send_all(connection, emails)
+            finally:
+                connection.close()
+        for email in emails:
+            email.claimed_by, email.claimed_at = '', None
+        OutgoingEmail.objects.bulk_update(emails, (
+            'message', 'sent_at', 'send_after', 'attempts', 'last_error',
+            'claimed_by', 'claimed_at'
+        ))
+        sent = sum(1 for email in emails if email.sent_at)
+        return sent, len(emails) - sent
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        while True:
+            sent, failed = self.send_batch()
+            if sent or failed:
+                self.stdout.write(self.style.SUCCESS(
+                    f'Отправлено писем: {sent}, отложено: {failed}'
+                ))
+            if sent + failed == self.batch_size:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -1,8 +1,18 @@
+from datetime import timedelta
+
 from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import UserManager as AuthUserManager
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Q
+from django.utils import timezone
 
 from core import constants as const
+from core.models import TimestampedQuerySet
+
+
+class UserManager(AuthUserManager.from_queryset(TimestampedQuerySet)):
+    """Менеджер пользователей, обновляющий время изменения."""
 
 
 class User(AbstractUser):
@@ -31,6 +41,13 @@ class User(AbstractUser):
         default=USER,
         verbose_name='Роль',
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        db_index=True,
+        verbose_name='Дата изменения',
+    )
+
+    objects = UserManager()
 
     class Meta:
         verbose_name = 'Пользователь'
@@ -59,3 +76,86 @@ class User(AbstractUser):
     @property
     def is_moderator(self):
         return self.role == self.MODERATOR
+
+
+class OutgoingEmailQuerySet(models.QuerySet):
+
+    def pending(self, max_attempts, claim_timeout):
+        """
+        Неотправленные письма, время очередной попытки которых наступило
+        и которые не заняты другим обработчиком. Занятое письмо снова
+        становится доступным через claim_timeout секунд, если обработчик
+        завершился, не успев его отправить.
+        """
+        now = timezone.now()
+        return self.filter(
+            Q(claimed_at__isnull=True)
+            | Q(claimed_at__lt=now - timedelta(seconds=claim_timeout)),
+            sent_at__isnull=True,
+            attempts__lt=max_attempts,
+            send_after__lte=now,
+        ).order_by('send_after', 'id')
+
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди на отправку."""
+
+    subject = models.CharField(
+        max_length=const.MAX_LENGHT_CHAR_FIELD,
+        verbose_name='Тема'
+    )
+    message = models.TextField(verbose_name='Текст')
+    from_email = models.EmailField(
+        max_length=const.MAX_LENGHT_EMEIL_FIELD,
+        verbose_name='Отправитель'
+    )
+    recipient = models.EmailField(
+        max_length=const.MAX_LENGHT_EMEIL_FIELD,
+        verbose_name='Получатель'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания'
+    )
+    send_after = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Отправить не раньше'
+    )
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Дата отправки'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Количество попыток'
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name='Последняя ошибка'
+    )
+    claimed_by = models.CharField(
+        max_length=32,
+        blank=True,
+        verbose_name='Обработчик'
+    )
+    claimed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Занято обработчиком'
+    )
+
+    objects = OutgoingEmailQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        indexes = [
+            models.Index(
+                fields=['sent_at', 'send_after'],
+                name='outgoing_email_pending_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'[:const.MAX_STR_LENGTH]
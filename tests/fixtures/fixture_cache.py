@@ -0,0 +1,26 @@
+import pytest
+from django.core.cache import caches
+
+
+@pytest.fixture(autouse=True)
+def shared_cache_dir(settings, tmp_path):
+    settings.CACHES = {
+        **settings.CACHES,
+        'shared': {**settings.CACHES['shared'], 'LOCATION': tmp_path},
+    }
+
+
+@pytest.fixture(autouse=True)
+def clear_caches(shared_cache_dir):
+    for cache in caches.all():
+        cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def throttle_store(settings, tmp_path):
+    settings.THROTTLE_STORE_PATH = tmp_path / 'throttle.sqlite3'
+
+
+@pytest.fixture(autouse=True)
+def metrics_dir(settings, tmp_path):
+    settings.METRICS_DIR = tmp_path / 'metrics'
@@ -0,0 +1,103 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.v1.reviews.views import TitleViewSet
+from reviews.models import Review, Title
+from tests.utils import create_reviews, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_reviews(self, admin_client, admin, user,
+                                       user_client, moderator,
+                                       moderator_client, client):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        assert self.get_rating(client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения обновляется при создании '
+            'отзыва.'
+        )
+
+        response = user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[1]['id']
+            ),
+            data={'score': 8}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(client, title_id) == 6, (
+            'Проверьте, что рейтинг произведения обновляется при изменении '
+            'оценки отзыва.'
+        )
+
+        response = admin_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(client, title_id) == 6, (
+            'Проверьте, что рейтинг произведения обновляется при удалении '
+            'отзыва.'
+        )
+
+        user.delete()
+        assert self.get_rating(client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения обновляется при каскадном '
+            'удалении отзывов вместе с автором.'
+        )
+
+        moderator.delete()
+        assert self.get_rating(client, title_id) is None, (
+            'Проверьте, что у произведения без отзывов рейтинг равен `None`.'
+        )
+
+    def test_02_stale_title_keeps_rating(self, admin_client, user,
+                                         monkeypatch, client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        get_object = TitleViewSet.get_object
+
+        def get_object_before_review(view):
+            title = get_object(view)
+            Review.objects.create(
+                author=user, title=Title.objects.get(pk=title_id),
+                text='Отзыв', score=7
+            )
+            return title
+
+        monkeypatch.setattr(
+            TitleViewSet, 'get_object', get_object_before_review
+        )
+        response = admin_client.patch(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id),
+            data={'name': 'Новое название'}, format='json'
+        )
+        assert response.status_code == HTTPStatus.OK
+        monkeypatch.undo()
+        title = Title.objects.get(pk=title_id)
+        assert title.name == 'Новое название'
+        assert (title.rating_sum, title.review_count) == (7, 1), (
+            'Проверьте, что изменение произведения, загруженного до нового '
+            'отзыва, не перезаписывает сумму оценок и количество отзывов.'
+        )
+        assert self.get_rating(client, title_id) == 7
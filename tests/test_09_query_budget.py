@@ -0,0 +1,165 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.serializers import ModelSerializer
+
+from reviews.models import Category, Comments, Genre, Review, Title
+from tests.utils import create_single_review
+
+
+def create_many_titles(count):
+    genres = [
+        Genre.objects.create(name=f'Жанр {idx}', slug=f'genre-{idx}')
+        for idx in range(3)
+    ]
+    for idx in range(count):
+        category = Category.objects.create(
+            name=f'Категория {idx}', slug=f'category-{idx}'
+        )
+        title = Title.objects.create(
+            name=f'Произведение {idx}', year=2000, category=category
+        )
+        title.genre.set(genres)
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK, (
+        f'Проверьте, что GET-запрос к `{url}` возвращает ответ со статусом '
+        '200.'
+    )
+    return len(context)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09QueryBudget:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    TITLES_QUERY_BUDGET = 3
+
+    def test_01_titles_list(self, client):
+        create_many_titles(20)
+        small_page = count_queries(client, f'{self.TITLES_URL}?limit=1')
+        large_page = count_queries(client, f'{self.TITLES_URL}?limit=20')
+        assert small_page == large_page, (
+            f'Проверьте, что количество запросов к БД при GET-запросе к '
+            f'`{self.TITLES_URL}` не зависит от размера страницы: '
+            f'{small_page} запрос(ов) для одного произведения и '
+            f'{large_page} для двадцати.'
+        )
+        assert large_page <= self.TITLES_QUERY_BUDGET, (
+            f'GET-запрос к `{self.TITLES_URL}` выполняет {large_page} '
+            f'запрос(ов) к БД, допустимо не больше '
+            f'{self.TITLES_QUERY_BUDGET}.'
+        )
+
+    def test_02_title_detail(self, client):
+        create_many_titles(1)
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(
+            title_id=Title.objects.get().pk
+        )
+        queries = count_queries(client, url)
+        assert queries <= 2, (
+            f'GET-запрос к `{self.TITLE_DETAIL_URL_TEMPLATE}` выполняет '
+            f'{queries} запрос(ов) к БД, допустимо не больше 2.'
+        )
+
+    def test_03_review_parent_title(self, client, user_client):
+        create_many_titles(1)
+        title_id = Title.objects.get().pk
+        url = f'/api/v1/titles/{title_id}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            create_single_review(user_client, title_id, 'Отзыв', 5)
+        title_lookups = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "reviews_title"' in query['sql']
+        ]
+        assert len(title_lookups) == 1, (
+            f'Проверьте, что при POST-запросе к `{url}` произведение '
+            'запрашивается из БД один раз за запрос.'
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            client.get(url)
+        assert not any(
+            'FROM "reviews_title"' in query['sql']
+            for query in context.captured_queries
+        ), (
+            f'Проверьте, что GET-запрос к непустому списку `{url}` не '
+            'выполняет отдельный запрос к произведению.'
+        )
+
+    def test_04_review_uniqueness(self, user_client):
+        create_many_titles(1)
+        title_id = Title.objects.get().pk
+        url = f'/api/v1/titles/{title_id}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            create_single_review(user_client, title_id, 'Отзыв', 5)
+        assert not any(
+            query['sql'].startswith('SELECT')
+            and 'FROM "reviews_review"' in query['sql']
+            for query in context.captured_queries
+        ), (
+            f'Проверьте, что POST-запрос к `{url}` не проверяет уникальность '
+            'отзыва отдельным запросом: её обеспечивает ограничение в БД.'
+        )
+
+        response = user_client.post(url, data={'text': 'Ещё', 'score': 1})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {
+            'non_field_errors': ['Вы уже оставили отзыв!']
+        }, (
+            'Проверьте, что повторный отзыв пользователя на произведение '
+            'возвращает ответ со статусом 400 и прежним сообщением.'
+        )
+        assert Title.objects.get().rating == 5
+
+    def test_05_review_and_comment_authors(self, client, django_user_model):
+        create_many_titles(1)
+        title = Title.objects.get()
+        authors = [
+            django_user_model.objects.create_user(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+            )
+            for idx in range(20)
+        ]
+        reviews = [
+            Review.objects.create(
+                title=title, author=author, text='Отзыв', score=5
+            )
+            for author in authors
+        ]
+        for author in authors:
+            Comments.objects.create(
+                review=reviews[0], author=author, text='Комментарий'
+            )
+        for url in (
+            f'/api/v1/titles/{title.pk}/reviews/',
+            f'/api/v1/titles/{title.pk}/reviews/{reviews[0].pk}/comments/',
+        ):
+            small_page = count_queries(client, f'{url}?limit=1')
+            large_page = count_queries(client, f'{url}?limit=20')
+            assert small_page == large_page, (
+                f'Проверьте, что количество запросов к БД при GET-запросе к '
+                f'`{url}` не зависит от размера страницы: авторы должны '
+                'загружаться вместе с объектами.'
+            )
+
+    def test_06_review_other_integrity_errors(self, user_client, monkeypatch):
+        create_many_titles(1)
+        title_id = Title.objects.get().pk
+
+        def create(self, validated_data):
+            raise IntegrityError('NOT NULL constraint failed')
+
+        monkeypatch.setattr(ModelSerializer, 'create', create)
+        with pytest.raises(IntegrityError):
+            user_client.post(
+                f'/api/v1/titles/{title_id}/reviews/',
+                data={'text': 'Отзыв', 'score': 5}
+            )
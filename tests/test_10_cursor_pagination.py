@@ -0,0 +1,48 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_reviews_cursor(self, client, admin_client, admin, user,
+                               user_client, moderator, moderator_client):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        response = client.get(url, {'cursor': '', 'limit': 2})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.REVIEWS_URL_TEMPLATE}` с '
+            'параметром `cursor` возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что при курсорной пагинации общее количество '
+            'объектов не подсчитывается.'
+        )
+        received = [review['id'] for review in data['results']]
+        assert len(received) == 2
+        assert data['next'], (
+            'Проверьте, что при курсорной пагинации в ответе есть ссылка на '
+            'следующую страницу.'
+        )
+
+        data = client.get(data['next']).json()
+        received += [review['id'] for review in data['results']]
+        assert data['next'] is None
+        assert received == sorted(
+            (review['id'] for review in reviews), reverse=True
+        ), (
+            'Проверьте, что курсорная пагинация возвращает все отзывы '
+            'от новых к старым без повторов.'
+        )
@@ -0,0 +1,54 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def search(self, client, query):
+        response = client.get(self.TITLES_URL, {'search': query})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` с параметром '
+            '`search` возвращает ответ со статусом 200.'
+        )
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.post(self.TITLES_URL, data={
+            'name': 'Орешки',
+            'year': 2000,
+            'genre': titles[1]['genre'],
+            'category': titles[1]['category'],
+            'description': 'Почти Терминатор'
+        })
+
+        assert self.search(client, 'терминат') == ['Терминатор', 'Орешки'], (
+            'Проверьте, что поиск идёт по названию и описанию по префиксу '
+            'слова, а совпадения в названии стоят выше.'
+        )
+        assert self.search(client, 'yippie') == ['Крепкий орешек']
+        assert self.search(client, '"') == []
+
+        admin_client.patch(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[1]['id']),
+            data={'description': 'Без описания'}
+        )
+        assert self.search(client, 'yippie') == [], (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'произведения.'
+        )
+
+        admin_client.delete(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        )
+        assert self.search(client, 'терминат') == ['Орешки'], (
+            'Проверьте, что удалённое произведение исключается из поискового '
+            'индекса.'
+        )
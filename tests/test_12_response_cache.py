@@ -0,0 +1,63 @@
+import pytest
+from django.db import transaction
+
+from api.v1 import cache
+from reviews.models import Genre
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ResponseCache:
+
+    GENRES_URL = '/api/v1/genres/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def test_01_genres_cache(self, client, admin_client):
+        response = client.get(self.GENRES_URL)
+        assert response['X-Cache'] == 'MISS'
+        response = client.get(self.GENRES_URL)
+        assert response['X-Cache'] == 'HIT', (
+            f'Проверьте, что повторный GET-запрос к `{self.GENRES_URL}` '
+            'обслуживается из кэша.'
+        )
+        response = client.get(self.GENRES_URL, {'search': 'Драма'})
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что ключ кэша учитывает параметры запроса.'
+        )
+
+        invalidations = cache.get_stats()['invalidations']
+        admin_client.post(
+            self.GENRES_URL, data={'name': 'Драма', 'slug': 'drama'}
+        )
+        assert cache.get_stats()['invalidations'] > invalidations
+        response = client.get(self.GENRES_URL)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['count'] == 1, (
+            'Проверьте, что создание жанра сбрасывает закэшированный список '
+            'жанров.'
+        )
+
+    def test_02_title_cache_follows_reviews(self, client, admin_client,
+                                            user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        assert client.get(url).json()['rating'] is None
+        assert client.get(url)['X-Cache'] == 'HIT'
+
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 7)
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['rating'] == 7, (
+            'Проверьте, что новый отзыв сбрасывает закэшированное '
+            'произведение и его рейтинг.'
+        )
+
+    def test_03_invalidation_after_commit(self):
+        versions = cache.get_versions((Genre,))
+        with transaction.atomic():
+            Genre.objects.create(name='Драма', slug='drama')
+            assert cache.get_versions((Genre,)) == versions, (
+                'Проверьте, что версия данных в кэше меняется только после '
+                'фиксации транзакции.'
+            )
+        assert cache.get_versions((Genre,)) != versions
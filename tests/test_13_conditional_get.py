@@ -0,0 +1,180 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Genre, Review, Title
+from tests.utils import (
+    create_reviews, create_single_review, create_titles
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ConditionalGet:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def test_01_titles_etag(self, client, admin_client):
+        _, categories, genres = create_titles(admin_client)
+        response = client.get(self.TITLES_URL)
+        etag = response['ETag']
+        response = client.get(self.TITLES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` с актуальным '
+            '`If-None-Match` возвращает ответ со статусом 304.'
+        )
+        admin_client.post('/api/v1/genres/', data={
+            'name': 'Драма', 'slug': 'drama'
+        })
+        response = client.get(self.TITLES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что ETag списка произведений строится по самим '
+            'произведениям и не меняется при создании нового жанра.'
+        )
+        genre = Genre.objects.get(slug=genres[0]['slug'])
+        genre.name = 'Другое название'
+        genre.save()
+        response = client.get(self.TITLES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение жанра произведения меняет ETag '
+            'списка произведений.'
+        )
+        etag = response['ETag']
+        admin_client.delete(f'/api/v1/categories/{categories[0]["slug"]}/')
+        response = client.get(self.TITLES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что удаление категории произведения меняет ETag '
+            'списка произведений.'
+        )
+
+    def test_02_reviews_etag(self, client, admin_client, admin, user,
+                             user_client, moderator_client):
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        etag = response['ETag']
+        assert response['Last-Modified']
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{self.REVIEWS_URL_TEMPLATE}` с '
+            'актуальным `If-None-Match` возвращает ответ со статусом 304.'
+        )
+
+        create_single_review(moderator_client, titles[0]['id'], 'Новый', 3)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что новый отзыв меняет ETag списка отзывов.'
+        )
+
+        etag = response['ETag']
+        admin_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=reviews[0]['id']
+            )
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что удаление отзыва меняет ETag списка отзывов.'
+        )
+
+    def test_03_review_last_modified(self, client, admin_client, admin,
+                                     user, user_client):
+        reviews, titles = create_reviews(admin_client, {user: user_client})
+        url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        response = client.get(url)
+        last_modified = response['Last-Modified']
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{self.REVIEW_DETAIL_URL_TEMPLATE}` '
+            'с актуальным `If-Modified-Since` возвращает ответ со статусом '
+            '304.'
+        )
+        response = client.get(
+            url, HTTP_IF_MODIFIED_SINCE='Mon, 01 Jan 2001 00:00:00 GMT'
+        )
+        assert response.status_code == HTTPStatus.OK
+
+    def test_04_etag_without_signals(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get(self.TITLES_URL)
+        etag = response['ETag']
+
+        Title.objects.filter(pk=titles[0]['id']).update(name='Изменено')
+        response = client.get(self.TITLES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ETag списка произведений строится по состоянию '
+            'базы данных и меняется при изменении без сигналов.'
+        )
+        assert 'Изменено' in {
+            title['name'] for title in response.json()['results']
+        }, (
+            'Проверьте, что после изменения данных список произведений '
+            'не отдаётся из кэша.'
+        )
+
+        etag = response['ETag']
+        Title.objects.get(pk=titles[0]['id']).genre.set(
+            [Genre.objects.last()]
+        )
+        response = client.get(self.TITLES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение жанров произведения меняет ETag '
+            'списка произведений.'
+        )
+
+    def test_05_empty_list_of_deleted_parent(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        review = create_single_review(
+            admin_client, titles[0]['id'], 'Текст', 5
+        ).json()
+        urls = (
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[1]['id']),
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+            + f'{review["id"]}/comments/',
+        )
+        etags = [client.get(url)['ETag'] for url in urls]
+
+        Title.objects.filter(pk=titles[1]['id']).delete()
+        Review.objects.filter(pk=review['id']).delete()
+        for url, etag in zip(urls, etags):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что GET-запрос к `{url}` с ETag пустого списка '
+                'после удаления родительского объекта возвращает ответ '
+                'со статусом 404, а не 304.'
+            )
+
+    def test_06_reviews_etag_follows_authors(self, client, admin_client,
+                                             admin, user, user_client,
+                                             django_user_model):
+        reviews, titles = create_reviews(admin_client, {user: user_client})
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        etag = client.get(url)['ETag']
+
+        django_user_model.objects.create_user(
+            username='new_user', email='new_user@yamdb.fake'
+        )
+        admin.bio = 'Новое описание'
+        admin.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что регистрация и изменение пользователей, '
+            'не являющихся авторами отзывов, не меняют ETag списка отзывов.'
+        )
+        user_client.patch(
+            '/api/v1/users/me/', data={'username': 'renamed'}, format='json'
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение автора отзыва меняет ETag списка '
+            'отзывов.'
+        )
+        assert response.json()['results'][0]['author'] == 'renamed'
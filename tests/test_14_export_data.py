@@ -0,0 +1,61 @@
+import gzip
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from reviews.models import Genre
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14ExportData:
+
+    def read_files(self, directory):
+        return {
+            path.name: gzip.decompress(path.read_bytes())
+            for path in directory.iterdir()
+        }
+
+    def test_01_round_trip(self, tmp_path, admin_client, admin, user,
+                           user_client, user_superuser):
+        author_map = {admin: admin_client, user: user_client}
+        _, reviews, _ = create_comments(admin_client, author_map)
+
+        call_command('export_data', tmp_path / 'first', '--gzip')
+        exported = self.read_files(tmp_path / 'first')
+        assert 'review.csv.gz' in exported
+        assert len(exported['review.csv.gz'].splitlines()) == (
+            len(reviews) + 1
+        ), 'Проверьте, что команда `export_data` выгружает все отзывы.'
+
+        call_command('flush', interactive=False)
+        call_command(
+            'load_data', data_dir=tmp_path / 'first', workers=0
+        )
+        call_command('export_data', tmp_path / 'second', '--gzip')
+        assert self.read_files(tmp_path / 'second') == exported, (
+            'Проверьте, что данные, выгруженные командой `export_data`, '
+            'загружаются командой `load_data` без потерь.'
+        )
+        User = get_user_model()
+        assert User.objects.get(pk=admin.pk).check_password('1234567'), (
+            'Проверьте, что команда `export_data` выгружает пароли '
+            'пользователей.'
+        )
+        superuser = User.objects.get(pk=user_superuser.pk)
+        assert superuser.is_superuser and superuser.is_staff, (
+            'Проверьте, что команда `export_data` выгружает права '
+            'пользователей.'
+        )
+
+    def test_02_jsonl(self, tmp_path, admin_client):
+        admin_client.post(
+            '/api/v1/genres/', data={'name': 'Драма', 'slug': 'drama'}
+        )
+        call_command('export_data', tmp_path, format='jsonl')
+        assert (tmp_path / 'genre.jsonl').read_text(encoding='utf-8') == (
+            f'{{"id": {Genre.objects.get().pk}, "name": "Драма", '
+            '"slug": "drama"}\n'
+        ), 'Проверьте формат JSON Lines команды `export_data`.'
@@ -0,0 +1,67 @@
+import json
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15StreamingExport:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def read_lines(self, response):
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'] == 'application/x-ndjson'
+        return [
+            json.loads(line) for line in
+            b''.join(response.streaming_content).decode().splitlines()
+        ]
+
+    def test_01_title_reviews_export(self, client, admin_client, admin,
+                                     user, user_client):
+        author_map = {admin: admin_client, user: user_client}
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        exported = self.read_lines(client.get(f'{url}export/'))
+        listed = client.get(url).json()['results']
+        assert sorted(exported, key=lambda review: review['id']) == sorted(
+            listed, key=lambda review: review['id']
+        ), (
+            f'Проверьте, что выгрузка `{url}export/` совпадает с данными, '
+            f'которые возвращает `{url}`.'
+        )
+
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        exported = self.read_lines(client.get(f'{url}export/'))
+        assert [comment['id'] for comment in exported] == sorted(
+            comment['id'] for comment in comments
+        )
+
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[1]['id'])
+        assert self.read_lines(client.get(f'{url}export/')) == []
+
+    def test_02_catalogue_export(self, client, user_client, admin_client,
+                                 admin, user):
+        author_map = {admin: admin_client, user: user_client}
+        _, reviews, _ = create_comments(admin_client, author_map)
+        for url in ('/api/v1/reviews/export/', '/api/v1/comments/export/'):
+            assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+            assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN, (
+                f'Проверьте, что выгрузка `{url}` доступна только '
+                'администратору.'
+            )
+        exported = self.read_lines(admin_client.get('/api/v1/reviews/export/'))
+        assert [review['id'] for review in exported] == sorted(
+            review['id'] for review in reviews
+        )
+        assert {review['author'] for review in exported} == {
+            admin.username, user.username
+        }
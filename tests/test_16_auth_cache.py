@@ -0,0 +1,73 @@
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from api.v1.cache import get_user_cache, get_user_key
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16AuthCache:
+
+    ME_URL = '/api/v1/users/me/'
+    USERS_URL = '/api/v1/users/'
+
+    def test_01_cached_user(self, user_client):
+        user_client.get(self.ME_URL)
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get(self.ME_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert len(context) == 0, (
+            'Проверьте, что пользователь, аутентифицированный по JWT-токену, '
+            'берётся из кэша без запроса к базе данных.'
+        )
+
+    def test_02_role_change(self, admin_client, user, user_client):
+        assert user_client.get(self.USERS_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+        admin_client.patch(
+            f'{self.USERS_URL}{user.username}/', data={'role': 'admin'}
+        )
+        assert user_client.get(self.USERS_URL).status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение роли пользователя сбрасывает его '
+            'запись в кэше аутентификации.'
+        )
+
+    def test_03_deleted_user(self, admin_client, user, user_client):
+        assert user_client.get(self.ME_URL).status_code == HTTPStatus.OK
+        admin_client.delete(f'{self.USERS_URL}{user.username}/')
+        assert user_client.get(self.ME_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), (
+            'Проверьте, что удалённый пользователь не может '
+            'аутентифицироваться по ранее выданному токену.'
+        )
+
+    def test_04_shared_cache(self):
+        assert not isinstance(
+            caches[settings.USER_CACHE_ALIAS], LocMemCache
+        ), (
+            'Проверьте, что кэш аутентификации общий для всех процессов '
+            'сервера, а не хранится в памяти одного процесса.'
+        )
+
+    def test_05_invalidation_after_commit(self, user, user_client):
+        user_client.get(self.ME_URL)
+        key = get_user_key(user.pk)
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                user.role = 'admin'
+                user.save()
+                raise RuntimeError
+        assert get_user_cache().get(key) is not None, (
+            'Проверьте, что запись пользователя в кэше сбрасывается только '
+            'после фиксации транзакции.'
+        )
+        user.role = 'admin'
+        user.save()
+        assert get_user_cache().get(key) is None
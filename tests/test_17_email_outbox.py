@@ -0,0 +1,122 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+from users.management.commands.send_emails import (
+    Command as SendEmailsCommand
+)
+from users.models import OutgoingEmail
+
+
+class FailingEmailBackend(BaseEmailBackend):
+
+    def send_messages(self, email_messages):
+        raise ConnectionError('Почтовый сервер недоступен')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    VALID_DATA = {
+        'email': 'valid@yamdb.fake',
+        'username': 'valid_username'
+    }
+
+    def test_01_signup_enqueues(self, client):
+        client.post(self.URL_SIGNUP, data=self.VALID_DATA)
+        assert len(mail.outbox) == 0, (
+            f'Проверьте, что POST-запрос к `{self.URL_SIGNUP}` не отправляет '
+            'письмо сам, а ставит его в очередь.'
+        )
+        assert OutgoingEmail.objects.get().recipient == (
+            self.VALID_DATA['email']
+        )
+
+        call_command('send_emails')
+        assert [message.to for message in mail.outbox] == [
+            [self.VALID_DATA['email']]
+        ]
+        email = OutgoingEmail.objects.get()
+        assert email.sent_at is not None
+        call_command('send_emails')
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что отправленное письмо не отправляется повторно.'
+        )
+
+    def test_02_retry(self, client, settings):
+        client.post(self.URL_SIGNUP, data=self.VALID_DATA)
+        settings.EMAIL_BACKEND = (
+            'tests.test_17_email_outbox.FailingEmailBackend'
+        )
+        call_command('send_emails')
+        email = OutgoingEmail.objects.get()
+        assert email.sent_at is None
+        assert email.attempts == 1
+        assert email.last_error == 'Почтовый сервер недоступен'
+        assert not OutgoingEmail.objects.pending(
+            settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+            settings.EMAIL_OUTBOX_CLAIM_TIMEOUT
+        ).exists(), (
+            'Проверьте, что неотправленное письмо откладывается до '
+            'следующей попытки.'
+        )
+
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+        OutgoingEmail.objects.update(send_after=email.created_at)
+        call_command('send_emails')
+        assert len(mail.outbox) == 1
+        assert OutgoingEmail.objects.get().attempts == 2
+
+    def test_03_confirmation_code_hidden(self, client, user_superuser):
+        client.post(self.URL_SIGNUP, data=self.VALID_DATA)
+        email = OutgoingEmail.objects.get()
+        code = email.message.rsplit(' ', 1)[-1]
+        client.force_login(user_superuser)
+        response = client.get(
+            f'/admin/users/outgoingemail/{email.pk}/change/'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert code not in response.content.decode(), (
+            'Проверьте, что код подтверждения не показывается в админке.'
+        )
+        call_command('send_emails')
+        assert mail.outbox[0].body.endswith(code)
+        assert OutgoingEmail.objects.get().message == '', (
+            'Проверьте, что текст отправленного письма с кодом '
+            'подтверждения не хранится в базе данных.'
+        )
+
+    def test_04_claimed_emails(self, client, settings):
+        for idx in range(2):
+            client.post(self.URL_SIGNUP, data={
+                'email': f'user{idx}@yamdb.fake', 'username': f'user{idx}'
+            })
+        worker = SendEmailsCommand()
+        worker.batch_size = 1
+        claimed = worker.claim_batch()
+        assert len(claimed) == 1
+        call_command('send_emails')
+        assert [message.to for message in mail.outbox] == [
+            [email.recipient]
+            for email in OutgoingEmail.objects.exclude(pk=claimed[0].pk)
+        ], (
+            'Проверьте, что письмо, занятое другим обработчиком, '
+            'не отправляется повторно.'
+        )
+
+        OutgoingEmail.objects.filter(pk=claimed[0].pk).update(
+            claimed_at=timezone.now() - timedelta(
+                seconds=settings.EMAIL_OUTBOX_CLAIM_TIMEOUT + 1
+            )
+        )
+        call_command('send_emails')
+        assert len(mail.outbox) == 2, (
+            'Проверьте, что письмо, обработчик которого завершился, '
+            'отправляется после EMAIL_OUTBOX_CLAIM_TIMEOUT.'
+        )
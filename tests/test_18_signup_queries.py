@@ -0,0 +1,60 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import ValidationError
+
+from api.v1.users.serializers import UserCreateSerializer
+
+
+def user_queries(context):
+    return [
+        query['sql'] for query in context.captured_queries
+        if '"users_user"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18SignupQueries:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    VALID_DATA = {
+        'email': 'valid@yamdb.fake',
+        'username': 'valid_username'
+    }
+
+    def test_01_signup_queries(self, client):
+        with CaptureQueriesContext(connection) as context:
+            client.post(self.URL_SIGNUP, data=self.VALID_DATA)
+        assert len(user_queries(context)) == 2, (
+            f'Проверьте, что POST-запрос к `{self.URL_SIGNUP}` для нового '
+            'пользователя выполняет не больше двух запросов к таблице '
+            'пользователей: проверку и создание.'
+        )
+        with CaptureQueriesContext(connection) as context:
+            client.post(self.URL_SIGNUP, data=self.VALID_DATA)
+        assert len(user_queries(context)) == 1, (
+            f'Проверьте, что повторный POST-запрос к `{self.URL_SIGNUP}` '
+            'выполняет один запрос к таблице пользователей.'
+        )
+
+    def test_02_concurrent_signup(self, django_user_model):
+        serializer = UserCreateSerializer(data=self.VALID_DATA)
+        assert serializer.is_valid()
+        user = django_user_model.objects.create(**self.VALID_DATA)
+        assert serializer.save() == user, (
+            'Проверьте, что одновременная регистрация одного и того же '
+            'пользователя возвращает уже созданного пользователя.'
+        )
+
+        serializer = UserCreateSerializer(data={
+            'email': 'other@yamdb.fake', 'username': 'other_username'
+        })
+        assert serializer.is_valid()
+        django_user_model.objects.create(
+            username='other_username', email='another@yamdb.fake'
+        )
+        with pytest.raises(ValidationError) as error:
+            serializer.save()
+        assert error.value.detail == {'non_field_errors': [
+            'Пользователь с таким именем уже существует'
+        ]}
@@ -0,0 +1,93 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.v1.throttling import (
+    AuthIdentityThrottle, AuthRateThrottle, SlidingWindowStore
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19AuthThrottling:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+
+    def test_01_identity_limit(self, client, monkeypatch):
+        monkeypatch.setattr(
+            AuthIdentityThrottle, 'THROTTLE_RATES', {'auth_identity': '3/min'}
+        )
+        data = {'email': 'valid@yamdb.fake', 'username': 'valid_username'}
+        for _ in range(3):
+            response = client.post(self.URL_SIGNUP, data=data)
+            assert response.status_code == HTTPStatus.OK
+        response = client.post(self.URL_SIGNUP, data=data)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что частые POST-запросы к `{self.URL_SIGNUP}` '
+            'с одним и тем же `username` ограничиваются.'
+        )
+        assert int(response['Retry-After']) <= 60
+        response = client.post(
+            self.URL_TOKEN,
+            data={'username': data['username'], 'confirmation_code': '1'}
+        )
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что лимит по `username` действует и для '
+            f'`{self.URL_TOKEN}`.'
+        )
+        response = client.post(self.URL_SIGNUP, data={
+            'email': 'other@yamdb.fake', 'username': 'other_username'
+        })
+        assert response.status_code == HTTPStatus.OK
+
+    def test_02_ip_limit(self, client, monkeypatch):
+        monkeypatch.setattr(
+            AuthRateThrottle, 'THROTTLE_RATES', {'auth': '2/min'}
+        )
+        for idx in range(2):
+            response = client.post(self.URL_SIGNUP, data={
+                'email': f'user{idx}@yamdb.fake', 'username': f'user{idx}'
+            })
+            assert response.status_code == HTTPStatus.OK
+        response = client.post(self.URL_SIGNUP, data={
+            'email': 'user2@yamdb.fake', 'username': 'user2'
+        })
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что частые POST-запросы к `{self.URL_SIGNUP}` '
+            'с одного IP-адреса ограничиваются.'
+        )
+        response = client.post(
+            self.URL_SIGNUP,
+            data={'email': 'user2@yamdb.fake', 'username': 'user2'},
+            HTTP_X_FORWARDED_FOR='10.0.0.2'
+        )
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что лимит по IP-адресу нельзя обойти, подставив '
+            'другой адрес в заголовок `X-Forwarded-For`.'
+        )
+        response = client.post(
+            self.URL_SIGNUP,
+            data={'email': 'user3@yamdb.fake', 'username': 'user3'},
+            REMOTE_ADDR='10.0.0.1'
+        )
+        assert response.status_code == HTTPStatus.OK
+
+    def test_03_stale_keys_purged(self):
+        store = SlidingWindowStore()
+        for idx in range(5):
+            assert store.hit([f'throttle_auth_{idx}'], 2, 60, 60 * 100)
+        assert store.hit(['throttle_auth_identity_a'], 2, 3600, 60 * 100)
+        assert store.hit(['throttle_auth_0'], 2, 60, 60 * 101)
+        assert store.hit(['throttle_auth_0'], 2, 60, 60 * 102)
+        rows = store.get_connection().execute(
+            'SELECT key, period FROM throttle_hits ORDER BY key, period'
+        ).fetchall()
+        assert rows == [
+            ('3600:throttle_auth_identity_a', 1),
+            ('60:throttle_auth_0', 101),
+            ('60:throttle_auth_0', 102),
+        ], (
+            'Проверьте, что раз в окно удаляются устаревшие счётчики '
+            'всех ключей, а не только ключа текущего запроса, и что '
+            'счётчики окон другой длительности не затрагиваются.'
+        )
@@ -0,0 +1,108 @@
+import json
+import logging
+import re
+import time
+
+import pytest
+from django.test import Client
+
+from api.v1.reviews.serializers import TitleGetSerializer
+from tests.utils import create_titles
+
+SLOW_LOGGER = 'api_yamdb.requests'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20RequestTiming:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_server_timing(self, settings):
+        settings.REQUEST_TIMING_ENABLED = True
+        response = Client().get(self.TITLES_URL)
+        server_timing = response['Server-Timing']
+        for metric in (
+            'db;dur=', 'serialize;dur=', 'render;dur=', 'total;dur='
+        ):
+            assert metric in server_timing, (
+                'Проверьте, что заголовок `Server-Timing` содержит метрику '
+                f'`{metric[:-5]}`.'
+            )
+        assert 'queries"' in server_timing
+
+    def test_02_disabled(self, settings):
+        settings.REQUEST_TIMING_ENABLED = False
+        response = Client().get(self.TITLES_URL)
+        assert not response.has_header('Server-Timing'), (
+            'Проверьте, что при выключенном `REQUEST_TIMING_ENABLED` '
+            'заголовок `Server-Timing` не добавляется.'
+        )
+
+    def test_03_slow_request_log(self, settings, caplog):
+        settings.REQUEST_TIMING_ENABLED = True
+        settings.REQUEST_TIMING_SLOW_QUERIES = 1
+        with caplog.at_level(logging.WARNING, logger=SLOW_LOGGER):
+            logging.getLogger(SLOW_LOGGER).addHandler(caplog.handler)
+            try:
+                Client().get(self.TITLES_URL)
+            finally:
+                logging.getLogger(SLOW_LOGGER).removeHandler(caplog.handler)
+        records = [
+            json.loads(record.getMessage()) for record in caplog.records
+            if record.name == SLOW_LOGGER
+        ]
+        assert records, (
+            'Проверьте, что запрос, превысивший порог по количеству '
+            'SQL-запросов, записывается в журнал.'
+        )
+        assert records[0]['path'] == self.TITLES_URL
+        assert records[0]['status'] == 200
+        assert records[0]['queries'] >= 1
+
+    def test_04_streaming_queries(self, settings, caplog, token_admin):
+        settings.REQUEST_TIMING_ENABLED = True
+        settings.REQUEST_TIMING_SLOW_QUERIES = 1
+        client = Client(
+            HTTP_AUTHORIZATION=f'Bearer {token_admin["access"]}'
+        )
+        with caplog.at_level(logging.WARNING, logger=SLOW_LOGGER):
+            logging.getLogger(SLOW_LOGGER).addHandler(caplog.handler)
+            try:
+                response = client.get('/api/v1/reviews/export/')
+                assert not caplog.records
+                b''.join(response.streaming_content)
+            finally:
+                logging.getLogger(SLOW_LOGGER).removeHandler(caplog.handler)
+        header_queries = int(
+            re.search(r'"(\d+) queries"', response['Server-Timing'])[1]
+        )
+        records = [
+            json.loads(record.getMessage()) for record in caplog.records
+            if record.name == SLOW_LOGGER
+        ]
+        assert len(records) == 1
+        assert records[0]['queries'] > header_queries, (
+            'Проверьте, что SQL-запросы, выполняемые при отправке тела '
+            'потокового ответа, учитываются в журнале.'
+        )
+
+    def test_05_serialize_time(self, settings, monkeypatch, admin_client):
+        settings.REQUEST_TIMING_ENABLED = True
+        create_titles(admin_client)
+        to_representation = TitleGetSerializer.to_representation
+
+        def slow_representation(serializer, instance):
+            time.sleep(0.01)
+            return to_representation(serializer, instance)
+
+        monkeypatch.setattr(
+            TitleGetSerializer, 'to_representation', slow_representation
+        )
+        response = Client().get(self.TITLES_URL)
+        serialize_time = float(
+            re.search(r'serialize;dur=([\d.]+)', response['Server-Timing'])[1]
+        )
+        assert serialize_time >= 20, (
+            'Проверьте, что время сериализации ответа учитывается '
+            'в отдельной метрике `serialize` заголовка `Server-Timing`.'
+        )
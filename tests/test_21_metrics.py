@@ -0,0 +1,75 @@
+import json
+import os
+import re
+from http import HTTPStatus
+
+import pytest
+
+
+def get_sample(text, sample):
+    match = re.search(rf'^{re.escape(sample)} (\S+)$', text, re.MULTILINE)
+    return float(match.group(1)) if match else 0
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21Metrics:
+
+    METRICS_URL = '/api/v1/metrics/'
+    TITLES_SAMPLE = (
+        'http_requests_total{method="GET",route="api:titles-list",'
+        'status="200"}'
+    )
+
+    def test_01_permissions(self, client, user_client):
+        assert client.get(self.METRICS_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        assert user_client.get(self.METRICS_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        ), (
+            f'Проверьте, что эндпоинт `{self.METRICS_URL}` доступен только '
+            'администратору.'
+        )
+
+    def test_02_request_metrics(self, client, admin_client):
+        before = admin_client.get(self.METRICS_URL).content.decode()
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/titles/')
+        response = admin_client.get(self.METRICS_URL)
+        assert response['Content-Type'].startswith('text/plain')
+        text = response.content.decode()
+        assert get_sample(text, self.TITLES_SAMPLE) == (
+            get_sample(before, self.TITLES_SAMPLE) + 2
+        ), (
+            f'Проверьте, что `{self.METRICS_URL}` учитывает запросы по '
+            'маршруту, методу и статусу ответа.'
+        )
+        assert '# TYPE http_request_duration_seconds histogram' in text
+        assert (
+            'http_request_duration_seconds_bucket{le="+Inf",method="GET",'
+            'route="api:titles-list",status="200"}'
+        ) in text
+        assert 'api_response_cache_total{event="hits"}' in text, (
+            'Проверьте, что метрики включают события кэша ответов.'
+        )
+
+    def test_03_other_processes(self, admin_client, settings):
+        settings.METRICS_DIR.mkdir(parents=True, exist_ok=True)
+        snapshot = {
+            'counters': [[
+                'http_requests_total',
+                {'route': 'sign_up', 'method': 'POST', 'status': 200},
+                3
+            ]],
+            'histograms': [],
+        }
+        (settings.METRICS_DIR / f'{os.getpid() + 1}.json').write_text(
+            json.dumps(snapshot)
+        )
+        text = admin_client.get(self.METRICS_URL).content.decode()
+        assert get_sample(
+            text,
+            'http_requests_total{method="POST",route="sign_up",status="200"}'
+        ) == 3, (
+            'Проверьте, что метрики других процессов суммируются.'
+        )
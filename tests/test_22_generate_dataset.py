@@ -0,0 +1,61 @@
+import pytest
+from django.core.management import call_command
+
+from api.v1 import cache
+from reviews.models import Comments, Review, Title
+
+OPTIONS = {
+    'users': 30, 'categories': 2, 'genres': 4, 'titles': 10,
+    'reviews': 100, 'comments': 50, 'seed': 42,
+}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22GenerateDataset:
+
+    def read_files(self, directory):
+        return {
+            path.name: path.read_text(encoding='utf-8')
+            for path in directory.iterdir()
+        }
+
+    def test_01_deterministic_csv(self, tmp_path):
+        call_command('generate_dataset', output=tmp_path / 'first', **OPTIONS)
+        call_command(
+            'generate_dataset', output=tmp_path / 'second', **OPTIONS
+        )
+        assert self.read_files(tmp_path / 'first') == self.read_files(
+            tmp_path / 'second'
+        ), (
+            'Проверьте, что команда `generate_dataset` с одним и тем же '
+            '`--seed` генерирует одинаковые данные.'
+        )
+
+        call_command('load_data', data_dir=tmp_path / 'first', workers=0)
+        assert Review.objects.count() == OPTIONS['reviews']
+        assert Comments.objects.count() == OPTIONS['comments']
+
+    def test_02_zipf_insert(self):
+        versions = cache.get_versions((Title, Review, Comments))
+        call_command('generate_dataset', **OPTIONS)
+        assert all(
+            old != new for old, new in zip(
+                versions.split('.'),
+                cache.get_versions((Title, Review, Comments)).split('.')
+            )
+        ), (
+            'Проверьте, что команда `generate_dataset` сбрасывает кэш '
+            'ответов API для записанных таблиц.'
+        )
+        assert Review.objects.count() == OPTIONS['reviews']
+        review_counts = list(
+            Title.objects.order_by('id').values_list(
+                'review_count', flat=True
+            )
+        )
+        assert review_counts == sorted(review_counts, reverse=True)
+        assert review_counts[0] > review_counts[-1], (
+            'Проверьте, что популярность произведений в `generate_dataset` '
+            'распределена по закону Ципфа.'
+        )
+        assert Title.objects.filter(rating__isnull=False).exists()
@@ -0,0 +1,81 @@
+import json
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import CommandError, call_command
+
+from api.management.commands.benchmark import SCENARIOS, percentile
+
+DATASET = {
+    'users': 20, 'categories': 2, 'genres': 3, 'titles': 10,
+    'reviews': 40, 'comments': 20, 'seed': 1,
+}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23Benchmark:
+
+    def test_01_percentile(self):
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile(values, 99) == 99
+        assert percentile([], 95) == 0.0
+
+    def test_02_results(self, tmp_path):
+        call_command('generate_dataset', stdout=StringIO(), **DATASET)
+        output = tmp_path / 'result.json'
+        call_command(
+            'benchmark', requests=60, warmup=5, output=output,
+            stdout=StringIO()
+        )
+        result = json.loads(output.read_text(encoding='utf-8'))
+        total = result['scenarios']['total']
+        assert total['requests'] == 60
+        assert total['errors'] == 0, (
+            'Проверьте, что все запросы команды `benchmark` получают '
+            'ожидаемые статусы ответов.'
+        )
+        assert set(result['scenarios']) <= {*SCENARIOS, 'total'}
+        for stats in result['scenarios'].values():
+            assert stats['p50_ms'] <= stats['p95_ms'] <= stats['p99_ms']
+            assert stats['queries_per_request'] > 0
+
+        stdout = StringIO()
+        call_command(
+            'benchmark', requests=20, warmup=0, compare=output,
+            weights='auth=0', stdout=stdout
+        )
+        assert 'p95' in stdout.getvalue(), (
+            'Проверьте, что команда `benchmark` с параметром `--compare` '
+            'выводит изменение p95 относительно сохранённых результатов.'
+        )
+
+    def test_03_throttling_disabled(self, tmp_path):
+        call_command('generate_dataset', stdout=StringIO(), **DATASET)
+        output = tmp_path / 'result.json'
+        call_command(
+            'benchmark', requests=30, warmup=0, output=output,
+            weights=','.join(
+                f'{name}={int(name == "auth")}' for name in SCENARIOS
+            ),
+            stdout=StringIO()
+        )
+        result = json.loads(output.read_text(encoding='utf-8'))
+        assert result['scenarios']['auth']['statuses'] == {'200': 30}, (
+            'Проверьте, что команда `benchmark` в текущем процессе '
+            'отключает ограничение частоты запросов к `auth/signup/`.'
+        )
+        assert settings.THROTTLING_ENABLED, (
+            'Проверьте, что после команды `benchmark` ограничение частоты '
+            'запросов снова включено.'
+        )
+
+    def test_04_invalid_options(self):
+        with pytest.raises(CommandError):
+            call_command('benchmark', weights='unknown=1')
+        with pytest.raises(CommandError):
+            call_command('benchmark', concurrency=4)
+        with pytest.raises(CommandError):
+            call_command('benchmark', stdout=StringIO())
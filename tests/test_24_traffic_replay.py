@@ -0,0 +1,117 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from reviews.models import Category
+
+
+@pytest.fixture
+def traffic_path(settings, tmp_path):
+    settings.TRAFFIC_RECORDING_ENABLED = True
+    settings.TRAFFIC_RECORDING_RATE = 1
+    settings.TRAFFIC_RECORDING_PATH = tmp_path / 'traffic.jsonl'
+    return settings.TRAFFIC_RECORDING_PATH
+
+
+def read_traffic(path):
+    with open(path, encoding='utf-8') as file:
+        return [json.loads(line) for line in file]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24TrafficReplay:
+
+    CATEGORY = {'name': 'Фильм', 'slug': 'films'}
+
+    def test_01_recording(self, traffic_path, admin_client, user_client):
+        admin_client.post(
+            '/api/v1/categories/', data=self.CATEGORY, format='json'
+        )
+        user_client.get('/api/v1/titles/?year=2000')
+        APIClient().post('/api/v1/auth/token/', data={
+            'username': 'TestUser', 'confirmation_code': 'secret-code',
+        }, format='json')
+        APIClient().post('/api/v1/auth/signup/', data={
+            'username': 'new_user', 'email': 'new_user@yamdb.fake',
+        }, format='json')
+        APIClient().get('/redoc/')
+
+        category, titles, token, signup = read_traffic(traffic_path)
+        assert category['method'] == 'POST'
+        assert category['path'] == '/api/v1/categories/'
+        assert category['body'] == self.CATEGORY
+        assert category['role'] == 'admin'
+        assert category['status'] == 201
+        assert titles['query'] == 'year=2000'
+        assert titles['role'] == 'user'
+        assert titles['user'] and titles['user'] != category['user']
+        assert token['role'] is None and token['user'] is None
+        assert token['body']['confirmation_code'] == '***', (
+            'Проверьте, что `TrafficRecordingMiddleware` не записывает '
+            'коды подтверждения.'
+        )
+        assert 'new_user@yamdb.fake' not in json.dumps(signup), (
+            'Проверьте, что `TrafficRecordingMiddleware` обезличивает email.'
+        )
+
+    def test_02_disabled(self, settings, tmp_path):
+        settings.TRAFFIC_RECORDING_PATH = tmp_path / 'traffic.jsonl'
+        APIClient().get('/api/v1/titles/')
+        assert not settings.TRAFFIC_RECORDING_PATH.exists(), (
+            'Проверьте, что без `TRAFFIC_RECORDING_ENABLED` запросы '
+            'не записываются.'
+        )
+
+    def test_03_replay(self, traffic_path, admin_client, user_client,
+                       tmp_path):
+        admin_client.post(
+            '/api/v1/categories/', data=self.CATEGORY, format='json'
+        )
+        user_client.get('/api/v1/categories/')
+        APIClient().get('/api/v1/titles/1/')
+        Category.objects.all().delete()
+        traffic_path.rename(tmp_path / 'recorded.jsonl')
+
+        output = tmp_path / 'result.json'
+        call_command(
+            'replay_traffic', tmp_path / 'recorded.jsonl', speed=0,
+            output=output, stdout=StringIO()
+        )
+        assert Category.objects.filter(slug='films').exists(), (
+            'Проверьте, что команда `replay_traffic` повторяет запросы '
+            'с токеном пользователя записанной роли.'
+        )
+        routes = json.loads(output.read_text(encoding='utf-8'))['routes']
+        assert routes['total']['requests'] == 3
+        assert routes['total']['errors'] == 0
+        assert routes['total']['mismatches'] == 0, (
+            'Проверьте, что при воспроизведении запросы получают '
+            'записанные статусы ответов.'
+        )
+        assert routes['GET /api/v1/titles/{id}/']['requests'] == 1
+
+    def test_04_throttling_disabled(self, tmp_path):
+        recorded = tmp_path / 'recorded.jsonl'
+        recorded.write_text(''.join(
+            json.dumps({
+                'time': idx, 'method': 'POST', 'path': '/api/v1/auth/signup/',
+                'query': '', 'role': None, 'user': None, 'status': 200,
+                'duration_ms': 1.0, 'body': {
+                    'username': f'user{idx}', 'email': f'user{idx}@yamdb.fake'
+                },
+            }) + '\n'
+            for idx in range(30)
+        ), encoding='utf-8')
+        output = tmp_path / 'result.json'
+        call_command(
+            'replay_traffic', recorded, speed=0, output=output,
+            stdout=StringIO()
+        )
+        routes = json.loads(output.read_text(encoding='utf-8'))['routes']
+        assert routes['total']['mismatches'] == 0, (
+            'Проверьте, что команда `replay_traffic` в текущем процессе '
+            'отключает ограничение частоты запросов.'
+        )
@@ -0,0 +1,214 @@
+from http import HTTPStatus
+
+import pytest
+from rest_framework.test import APIClient
+
+from api.management.commands.explain_queries import get_full_scans
+from api.v1.reviews import urls as reviews_urls
+from api.v1.users import urls as users_urls
+from reviews.models import (
+    Category, Comments, Genre, GenreTitle, Review, Title
+)
+from tests.utils import capture_queries, explain_query_plan
+
+OBJECTS_COUNT = 101
+
+PAGE_SIZES = (1, 100)
+
+TITLE_URL = '/api/v1/titles/{title_id}/'
+REVIEWS_URL = TITLE_URL + 'reviews/'
+REVIEW_URL = REVIEWS_URL + '{review_id}/'
+COMMENTS_URL = REVIEW_URL + 'comments/'
+
+# Маршрут, метод, адрес, клиент, ожидаемый статус, тело запроса
+# и допустимое количество запросов к БД.
+ROUTES = (
+    ('titles-list', 'get', '/api/v1/titles/', 'client',
+     HTTPStatus.OK, None, 3),
+    ('titles-detail', 'get', TITLE_URL, 'client',
+     HTTPStatus.OK, None, 2),
+    ('genres-list', 'get', '/api/v1/genres/', 'client',
+     HTTPStatus.OK, None, 2),
+    ('genres-detail', 'delete', '/api/v1/genres/{genre}/', 'admin_client',
+     HTTPStatus.NO_CONTENT, None, 5),
+    ('category-list', 'get', '/api/v1/categories/', 'client',
+     HTTPStatus.OK, None, 2),
+    ('category-detail', 'delete', '/api/v1/categories/{category}/',
+     'admin_client', HTTPStatus.NO_CONTENT, None, 6),
+    ('reviews-list', 'get', REVIEWS_URL, 'client',
+     HTTPStatus.OK, None, 3),
+    ('reviews-detail', 'get', REVIEW_URL, 'client',
+     HTTPStatus.OK, None, 1),
+    ('reviews-export', 'get', REVIEWS_URL + 'export/', 'admin_client',
+     HTTPStatus.OK, None, 2),
+    ('comments-list', 'get', COMMENTS_URL, 'client',
+     HTTPStatus.OK, None, 3),
+    ('comments-detail', 'get', COMMENTS_URL + '{comment_id}/', 'client',
+     HTTPStatus.OK, None, 1),
+    ('comments-export', 'get', COMMENTS_URL + 'export/', 'admin_client',
+     HTTPStatus.OK, None, 2),
+    ('reviews-export-export', 'get', '/api/v1/reviews/export/',
+     'admin_client', HTTPStatus.OK, None, 1),
+    ('comments-export-export', 'get', '/api/v1/comments/export/',
+     'admin_client', HTTPStatus.OK, None, 1),
+    ('users-list', 'get', '/api/v1/users/', 'admin_client',
+     HTTPStatus.OK, None, 2),
+    ('users-me', 'get', '/api/v1/users/me/', 'user_client',
+     HTTPStatus.OK, None, 0),
+    ('users-detail', 'get', '/api/v1/users/{username}/', 'admin_client',
+     HTTPStatus.OK, None, 1),
+    ('sign_up', 'post', '/api/v1/auth/signup/', 'client', HTTPStatus.OK,
+     {'username': 'new_user', 'email': 'new_user@yamdb.fake'}, 4),
+    ('check_code', 'post', '/api/v1/auth/token/', 'client',
+     HTTPStatus.BAD_REQUEST,
+     {'username': 'author0', 'confirmation_code': 'wrong'}, 1),
+    ('api-root', 'get', '/api/v1/', 'client', HTTPStatus.OK, None, 0),
+)
+
+# Маршрут и начало SQL-запросов, которым нужно прочитать всю таблицу:
+# количество объектов и последнее изменение для пагинации и ETag
+# нефильтрованного списка, выгрузка всей таблицы.
+ALLOWED_FULL_SCANS = (
+    ('titles-list', 'SELECT COUNT('),
+    ('genres-list', 'SELECT COUNT('),
+    ('category-list', 'SELECT COUNT('),
+    ('users-list', 'SELECT COUNT('),
+    ('reviews-export-export', 'SELECT'),
+    ('comments-export-export', 'SELECT'),
+)
+
+
+def get_route_names(patterns):
+    for pattern in patterns:
+        if hasattr(pattern, 'url_patterns'):
+            yield from get_route_names(pattern.url_patterns)
+        else:
+            yield pattern.name
+
+
+@pytest.fixture
+def client():
+    return APIClient()
+
+
+@pytest.fixture
+def dataset(admin, django_user_model):
+    """
+    По OBJECTS_COUNT объектов каждого вида, отзывов на одно
+    произведение и комментариев к одному отзыву.
+    """
+    django_user_model.objects.bulk_create(
+        django_user_model(
+            username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+        )
+        for idx in range(OBJECTS_COUNT)
+    )
+    authors = django_user_model.objects.filter(username__startswith='author')
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {idx}', slug=f'genre-{idx}')
+        for idx in range(OBJECTS_COUNT)
+    )
+    Category.objects.bulk_create(
+        Category(name=f'Категория {idx}', slug=f'category-{idx}')
+        for idx in range(OBJECTS_COUNT)
+    )
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {idx}', year=2000, category=category)
+        for idx, category in enumerate(Category.objects.all())
+    )
+    genres = list(Genre.objects.all()[:3])
+    GenreTitle.objects.bulk_create(
+        GenreTitle(title=title, genre=genre)
+        for title in Title.objects.all() for genre in genres
+    )
+    title = Title.objects.first()
+    Review.objects.bulk_create(
+        Review(title=title, author=author, text='Отзыв', score=5)
+        for author in authors
+    )
+    review = Review.objects.first()
+    Comments.objects.bulk_create(
+        Comments(review=review, author=author, text='Комментарий')
+        for author in authors
+    )
+    Title.objects.refresh_rating()
+    return {
+        'title_id': title.pk,
+        'review_id': review.pk,
+        'comment_id': Comments.objects.first().pk,
+        'genre': Genre.objects.last().slug,
+        'category': Category.objects.last().slug,
+        'username': authors.first().username,
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25QueryRegressions:
+
+    def get_client(self, request, client_name):
+        """Клиент, для которого пользователь токена уже в кэше."""
+        client = request.getfixturevalue(client_name)
+        client.get('/api/v1/users/me/')
+        return client
+
+    def is_allowed(self, name, sql):
+        return any(
+            name == route and sql.startswith(prefix)
+            for route, prefix in ALLOWED_FULL_SCANS
+        )
+
+    def get_urls(self, name, url, dataset):
+        url = url.format(**dataset)
+        if name.endswith('-list'):
+            return [f'{url}?limit={page_size}' for page_size in PAGE_SIZES]
+        return [url]
+
+    def test_01_all_routes_checked(self):
+        route_names = set(get_route_names(
+            reviews_urls.urlpatterns + users_urls.urlpatterns
+        ))
+        missing = route_names - {route[0] for route in ROUTES}
+        assert not missing, (
+            'Добавьте в `ROUTES` проверку количества запросов к БД для '
+            f'маршрутов: {", ".join(sorted(missing))}.'
+        )
+
+    @pytest.mark.parametrize(
+        'name,method,url,client_name,status,data,budget', ROUTES
+    )
+    def test_02_query_count(self, request, dataset, name, method, url,
+                            client_name, status, data, budget):
+        client = self.get_client(request, client_name)
+        counts = [
+            len(capture_queries(client, method, page_url, data, status))
+            for page_url in self.get_urls(name, url, dataset)
+        ]
+        assert len(set(counts)) == 1, (
+            f'Проверьте, что количество запросов к БД для маршрута `{name}` '
+            f'не зависит от размера страницы: {counts[0]} запрос(ов) '
+            f'на странице из {PAGE_SIZES[0]} объекта и {counts[-1]} '
+            f'на странице из {PAGE_SIZES[-1]}.'
+        )
+        assert counts[-1] <= budget, (
+            f'Маршрут `{name}` выполняет {counts[-1]} запрос(ов) к БД, '
+            f'допустимо не больше {budget}.'
+        )
+
+    @pytest.mark.parametrize(
+        'name,method,url,client_name,status,data,budget', ROUTES
+    )
+    def test_03_query_plan(self, request, dataset, name, method, url,
+                           client_name, status, data, budget):
+        client = self.get_client(request, client_name)
+        page_url = self.get_urls(name, url, dataset)[-1]
+        queries = capture_queries(client, method, page_url, data, status)
+        full_scans = [
+            f'{sql}\n  {line}'
+            for sql in queries
+            if sql.startswith('SELECT') and not self.is_allowed(name, sql)
+            for line in get_full_scans(sql, explain_query_plan(sql))
+        ]
+        assert not full_scans, (
+            f'Проверьте индексы для запросов маршрута `{name}`: '
+            'полное сканирование таблицы в планах\n' + '\n'.join(full_scans)
+        )
@@ -0,0 +1,62 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from api.management.commands.explain_queries import (
+    LIST_QUERIES, get_full_scans
+)
+
+DATASET = {
+    'users': 20, 'categories': 3, 'genres': 5, 'titles': 20,
+    'reviews': 60, 'comments': 60, 'seed': 5,
+}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26ExplainQueries:
+
+    def test_01_get_full_scans(self):
+        page = 'SELECT id FROM reviews_title ORDER BY name LIMIT 10'
+        index_scan = 'SCAN reviews_title USING INDEX title_idx'
+        assert get_full_scans(
+            'SELECT id FROM reviews_title', ['SCAN reviews_title']
+        )
+        assert not get_full_scans(page, [index_scan]), (
+            'Сканирование индекса в порядке ORDER BY ограничено LIMIT.'
+        )
+        assert get_full_scans(
+            page, [index_scan, 'USE TEMP B-TREE FOR ORDER BY']
+        ), 'Сортировка во временном B-дереве требует чтения всех строк.'
+        assert get_full_scans(
+            'SELECT COUNT(id) FROM reviews_title',
+            ['SCAN reviews_title USING COVERING INDEX title_idx']
+        ), 'Сканирование индекса без LIMIT читает весь индекс.'
+        assert get_full_scans(page, [
+            'SEARCH reviews_review USING INDEX review_idx (title_id=?)',
+            index_scan,
+        ]), 'Сканирование во вложенном цикле не ограничено LIMIT.'
+        assert not get_full_scans(
+            'SELECT id FROM reviews_review WHERE title_id = 1',
+            ['SEARCH reviews_review USING INDEX review_idx (title_id=?)']
+        )
+
+    def test_02_seeded_data(self):
+        call_command('generate_dataset', stdout=StringIO(), **DATASET)
+        stdout = StringIO()
+        call_command('explain_queries', '--fail-on-scan', stdout=stdout)
+        output = stdout.getvalue()
+        for name, _, _ in LIST_QUERIES:
+            assert name in output, (
+                'Проверьте, что команда `explain_queries` выводит план '
+                f'запроса `{name}`.'
+            )
+        assert 'нет данных' not in output
+
+    def test_03_no_data(self):
+        stdout = StringIO()
+        call_command('explain_queries', '--fail-on-scan', stdout=stdout)
+        assert 'нет данных для построения запроса' in stdout.getvalue(), (
+            'Проверьте, что команда `explain_queries` пропускает вложенные '
+            'списки, если в базе данных нет родительских объектов.'
+        )
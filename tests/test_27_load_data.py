@@ -0,0 +1,248 @@
+import csv
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from api.v1 import cache
+from reviews.management.commands.load_data import (
+    CHECKPOINT_FILE, TABLES_FILES, TABLES_ROWS, get_load_order
+)
+from reviews.models import Comments, Genre, GenreTitle, Review, Title
+
+DATASET = {
+    'users': 10, 'categories': 2, 'genres': 3, 'titles': 5,
+    'reviews': 20, 'comments': 20, 'seed': 3,
+}
+
+BAD_LINE = 14
+
+
+def write_dataset(directory):
+    call_command(
+        'generate_dataset', output=directory, stdout=StringIO(), **DATASET
+    )
+    return directory
+
+
+def edit_row(path, line, **values):
+    """Замена значений в строке CSV-файла с номером line."""
+    with open(path, encoding='utf-8', newline='') as file:
+        rows = list(csv.DictReader(file))
+    rows[line - 2].update(values)
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.DictWriter(file, rows[0].keys())
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def get_tables():
+    return {
+        model: list(
+            model.objects.order_by('pk').values_list(*TABLES_ROWS[model])
+        )
+        for model in TABLES_FILES
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27LoadData:
+
+    def test_01_batches_committed(self, tmp_path):
+        data_dir = write_dataset(tmp_path)
+        edit_row(data_dir / 'review.csv', BAD_LINE, score='много')
+        with pytest.raises(CommandError) as error:
+            call_command(
+                'load_data', data_dir=data_dir, batch_size=5, workers=0,
+                stdout=StringIO()
+            )
+        assert f'строка {BAD_LINE}, поле score' in str(error.value), (
+            'Проверьте, что команда `load_data` сообщает номер строки и поле '
+            'с ошибкой.'
+        )
+        assert Title.objects.count() == DATASET['titles']
+        saved = (BAD_LINE - 2) // 5 * 5
+        assert Review.objects.count() == saved, (
+            'Проверьте, что при ошибке в файле пачки строк, записанные '
+            'до неё, остаются в базе данных.'
+        )
+        checkpoint = json.loads(
+            (data_dir / CHECKPOINT_FILE).read_text(encoding='utf-8')
+        )
+        assert checkpoint['reviews.Review'] == saved, (
+            'Проверьте, что команда `load_data` сохраняет контрольную точку '
+            'после каждой записанной пачки.'
+        )
+
+    def test_02_atomic(self, tmp_path):
+        data_dir = write_dataset(tmp_path)
+        edit_row(data_dir / 'review.csv', BAD_LINE, score='много')
+        with pytest.raises(CommandError):
+            call_command(
+                'load_data', '--atomic', data_dir=data_dir, batch_size=5,
+                workers=0, stdout=StringIO()
+            )
+        assert not Title.objects.exists() and not Review.objects.exists(), (
+            'Проверьте, что с параметром `--atomic` ошибка загрузки '
+            'оставляет базу данных без изменений.'
+        )
+        assert not (data_dir / CHECKPOINT_FILE).exists()
+
+    def test_03_load_order(self):
+        order = get_load_order(tuple(TABLES_FILES))
+        for parent, child in (
+            (Title, Review), (Review, Comments), (Genre, GenreTitle),
+            (Title, GenreTitle),
+        ):
+            assert order.index(parent) < order.index(child), (
+                'Проверьте, что команда `load_data` загружает таблицу '
+                f'{child.__name__} после {parent.__name__}.'
+            )
+
+    def test_04_process_pool(self, tmp_path):
+        data_dir = write_dataset(tmp_path)
+        call_command(
+            'load_data', data_dir=data_dir, batch_size=7, workers=0,
+            stdout=StringIO()
+        )
+        expected = get_tables()
+        call_command('flush', interactive=False)
+        call_command(
+            'load_data', data_dir=data_dir, batch_size=7, workers=2,
+            stdout=StringIO()
+        )
+        assert get_tables() == expected, (
+            'Проверьте, что разбор файлов в пуле процессов загружает те же '
+            'данные, что и в одном потоке.'
+        )
+        assert Title.objects.filter(rating__isnull=False).exists()
+
+    def test_05_unknown_column(self, tmp_path):
+        data_dir = write_dataset(tmp_path)
+        genres = (data_dir / 'genre.csv').read_text(encoding='utf-8')
+        (data_dir / 'genre.csv').write_text(
+            genres.replace('slug', 'code', 1), encoding='utf-8'
+        )
+        with pytest.raises(CommandError, match='Поля code нет в таблице'):
+            call_command(
+                'load_data', data_dir=data_dir, workers=0, stdout=StringIO()
+            )
+
+    def test_06_upsert(self, tmp_path):
+        data_dir = write_dataset(tmp_path)
+        call_command(
+            'load_data', data_dir=data_dir, workers=0, stdout=StringIO()
+        )
+        edit_row(data_dir / 'review.csv', 3, text='Новый текст')
+        with open(data_dir / 'genre.csv', 'a', encoding='utf-8') as file:
+            file.write('100,Новый жанр,new-genre\n')
+
+        versions = cache.get_versions((Genre, Review, Title, Comments))
+        stdout = StringIO()
+        call_command(
+            'load_data', data_dir=data_dir, workers=0, mode='upsert',
+            stdout=stdout
+        )
+        output = stdout.getvalue()
+        changed = zip(
+            versions.split('.'),
+            cache.get_versions((Genre, Review, Title, Comments)).split('.')
+        )
+        assert [old != new for old, new in changed] == [
+            True, True, False, False
+        ], (
+            'Проверьте, что команда `load_data` сбрасывает кэш ответов API '
+            'только для изменённых таблиц.'
+        )
+        genres = DATASET['genres']
+        assert (
+            f'Genre загружены: {genres + 1} строк (добавлено 1, '
+            f'обновлено 0, пропущено {genres})'
+        ) in output, (
+            'Проверьте, что в режиме upsert команда `load_data` сообщает '
+            'количество добавленных, обновлённых и пропущенных строк.'
+        )
+        assert (
+            f'Review загружены: {DATASET["reviews"]} строк (добавлено 0, '
+            f'обновлено 1, пропущено {DATASET["reviews"] - 1})'
+        ) in output
+        assert Genre.objects.filter(slug='new-genre').exists()
+        assert Review.objects.filter(text='Новый текст').count() == 1
+        assert Review.objects.count() == DATASET['reviews']
+
+    def test_07_resume(self, tmp_path):
+        data_dir = write_dataset(tmp_path)
+        edit_row(data_dir / 'review.csv', BAD_LINE, score='много')
+        with pytest.raises(CommandError):
+            call_command(
+                'load_data', data_dir=data_dir, batch_size=5, workers=0,
+                stdout=StringIO()
+            )
+        edit_row(data_dir / 'review.csv', BAD_LINE, score='5')
+
+        stdout = StringIO()
+        call_command(
+            'load_data', '--resume', data_dir=data_dir, batch_size=5,
+            workers=0, stdout=stdout
+        )
+        saved = (BAD_LINE - 2) // 5 * 5
+        assert f'пропущено {saved})' in stdout.getvalue(), (
+            'Проверьте, что с параметром `--resume` команда `load_data` '
+            'пропускает строки, сохранённые до ошибки.'
+        )
+        assert Title.objects.count() == DATASET['titles']
+        assert Review.objects.count() == DATASET['reviews']
+        assert Comments.objects.count() == DATASET['comments']
+        assert not (data_dir / CHECKPOINT_FILE).exists(), (
+            'Проверьте, что после успешной загрузки контрольная точка '
+            'удаляется.'
+        )
+
+    def test_08_upsert_touches_changed_titles(self, tmp_path):
+        data_dir = write_dataset(tmp_path)
+        call_command(
+            'load_data', data_dir=data_dir, workers=0, stdout=StringIO()
+        )
+        updated = dict(Title.objects.values_list('pk', 'updated_at'))
+        call_command(
+            'load_data', data_dir=data_dir, workers=0, mode='upsert',
+            stdout=StringIO()
+        )
+        assert dict(
+            Title.objects.values_list('pk', 'updated_at')
+        ) == updated, (
+            'Проверьте, что загрузка в режиме upsert без изменений данных '
+            'не меняет произведения.'
+        )
+
+        review = Review.objects.order_by('pk').first()
+        edit_row(data_dir / 'review.csv', 2, score=str(review.score % 10 + 1))
+        call_command(
+            'load_data', data_dir=data_dir, workers=0, mode='upsert',
+            stdout=StringIO()
+        )
+        changed = {
+            pk for pk, updated_at in Title.objects.values_list(
+                'pk', 'updated_at'
+            ) if updated_at != updated[pk]
+        }
+        assert changed == {review.title_id}, (
+            'Проверьте, что команда `load_data` пересчитывает рейтинг '
+            'только произведений с изменёнными отзывами.'
+        )
+        title = Title.objects.get(pk=review.title_id)
+        scores = list(title.reviews.values_list('score', flat=True))
+        assert title.rating == sum(scores) / len(scores)
+
+        edit_row(data_dir / 'titles.csv', 2, name='Уникальное название')
+        call_command(
+            'load_data', data_dir=data_dir, workers=0, mode='upsert',
+            stdout=StringIO()
+        )
+        assert list(
+            Title.objects.search('Уникальное').values_list('pk', flat=True)
+        ) == [Title.objects.order_by('pk').first().pk], (
+            'Проверьте, что команда `load_data` обновляет поисковый индекс '
+            'изменённых произведений.'
+        )
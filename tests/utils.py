@@ -1,5 +1,8 @@
 from http import HTTPStatus
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 
 check_name_and_slug_patterns = (
     (
@@ -305,3 +308,24 @@ def check_fields(obj_type, url_pattern, obj, expected_data, detail=False):
         f'данные {obj_types[obj_type]}{results_in_msg}. Поле `id` не '
         'найдено или не является целым числом.'
     )
+
+
+def capture_queries(client, method, url, data=None,
+                    expected_status=HTTPStatus.OK):
+    """SQL-запросы, выполненные при обработке запроса к `url`."""
+    with CaptureQueriesContext(connection) as context:
+        response = getattr(client, method)(url, data=data, format='json')
+        if response.streaming:
+            b''.join(response.streaming_content)
+    assert response.status_code == expected_status, (
+        f'Проверьте, что {method.upper()}-запрос к `{url}` возвращает ответ '
+        f'со статусом {expected_status.value}.'
+    )
+    return [query['sql'] for query in context.captured_queries]
+
+
+def explain_query_plan(sql):
+    """Строки EXPLAIN QUERY PLAN для SQL-запроса."""
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return [row[-1] for row in cursor.fetchall()]